@@ -1 +1,12 @@
 # KMeans clustering logic
+import numpy as np
+
+
+def agrupar_semaxis(scores, n_clusters=2):
+    # Mismo clustering que Emociones4: KMeans 1-D sobre SemAxis_Score
+    from sklearn.cluster import KMeans
+
+    X = np.asarray(scores, dtype=float).reshape(-1, 1)
+    n_clusters = min(n_clusters, len(X))
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+    return kmeans.fit_predict(X).tolist()
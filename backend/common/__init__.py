@@ -0,0 +1,2 @@
+# Utilidades compartidas entre servicios (solo librería estándar + FastAPI):
+# métricas, logs JSON e IDs de mensaje. insights_api no depende de nlp_processor.
@@ -0,0 +1,23 @@
+# Configuración compartida (logs y métricas)
+import os
+
+# -------------------------------
+# Logs y métricas
+# -------------------------------
+LOG_NIVEL = os.getenv("LOG_NIVEL", "INFO")
+LOG_FORMATO = os.getenv("LOG_FORMATO", "json")  # json | texto
+# etapa: solo spans de etapa en el log | todos: también cada llamada a modelo
+LOG_SPANS = os.getenv("LOG_SPANS", "etapa")
+
+# Perfilado opt-in de una etapa: PERFIL_ETAPA=procesar_spacy
+PERFIL_ETAPA = os.getenv("PERFIL_ETAPA", "")
+PERFIL_MODO = os.getenv("PERFIL_MODO", "cprofile")  # cprofile | muestreo
+PERFIL_INTERVALO_MS = float(os.getenv("PERFIL_INTERVALO_MS", "5"))
+PERFIL_DIR = os.getenv("PERFIL_DIR", "perfiles")
+
+# -------------------------------
+# CORS (solo GET): orígenes que sirven el frontend
+# -------------------------------
+# Por defecto el bubble chart publicado en GitHub Pages; separar varios con comas
+CORS_ORIGENES = [o.strip() for o in os.getenv(
+    "CORS_ORIGENES", "https://julian-rosas.github.io").split(",") if o.strip()]
@@ -0,0 +1,8 @@
+# IDs de mensaje compartidos por el pipeline y la carga a la base
+import hashlib
+
+
+def id_mensaje(fecha, hora, texto):
+    """ID estable del mensaje cuando la fuente no trae uno."""
+    clave = f"{fecha}|{hora}|{texto}".encode("utf-8")
+    return hashlib.sha1(clave).hexdigest()[:16]
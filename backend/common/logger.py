@@ -0,0 +1,41 @@
+# Logger configuration
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+
+from . import config
+
+
+class FormatoJSON(logging.Formatter):
+    """Una línea JSON por registro; los campos de ``extra={"campos": ...}`` van al nivel raíz."""
+
+    def format(self, record):
+        datos = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        datos.update(getattr(record, "campos", {}))
+        if record.exc_info:
+            datos["exc"] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+def get_logger(nombre="passenger60"):
+    logger = logging.getLogger(nombre)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        if config.LOG_FORMATO == "json":
+            handler.setFormatter(FormatoJSON())
+        else:
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(config.LOG_NIVEL)
+        logger.propagate = False
+    return logger
+
+
+def evento(nombre, logger=None, **campos):
+    (logger or get_logger()).info(nombre, extra={"campos": {"evento": nombre, **campos}})
@@ -0,0 +1,218 @@
+# ==========================================================
+# Métricas en proceso: spans por etapa, contadores de filas y memoria
+# ==========================================================
+# Se exponen en formato Prometheus (/metrics) y como eventos JSON (logger).
+import cProfile
+import io
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from . import config
+from .logger import evento
+
+PREFIJO = "p60"
+CUBETAS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+
+_lock = threading.Lock()
+_contadores = defaultdict(float)   # (nombre, etiquetas) -> valor
+_medidores = {}                    # (nombre, etiquetas) -> valor
+_histogramas = {}                  # (nombre, etiquetas) -> [cubetas..., suma, cuenta]
+
+
+def _clave(nombre, etiquetas):
+    return nombre, tuple(sorted((k, str(v)) for k, v in etiquetas.items()))
+
+
+def contar(nombre, valor=1, **etiquetas):
+    with _lock:
+        _contadores[_clave(nombre, etiquetas)] += valor
+
+
+def fijar(nombre, valor, **etiquetas):
+    with _lock:
+        _medidores[_clave(nombre, etiquetas)] = valor
+
+
+def observar(nombre, valor, **etiquetas):
+    clave = _clave(nombre, etiquetas)
+    with _lock:
+        h = _histogramas.setdefault(clave, [0] * len(CUBETAS) + [0.0, 0])
+        for i, limite in enumerate(CUBETAS):
+            if valor <= limite:
+                h[i] += 1
+        h[-2] += valor
+        h[-1] += 1
+
+
+def rss_max_bytes():
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return maximo if sys.platform == "darwin" else maximo * 1024
+
+
+# -------------------------------
+# Spans
+# -------------------------------
+@contextmanager
+def medir(etapa, log=True, **etiquetas):
+    """Mide una etapa o llamada a modelo: histograma de segundos + evento JSON.
+
+    Con ``log=False`` (llamadas por fila o por petición) solo se actualiza el
+    histograma; LOG_SPANS=todos vuelve a registrar también esas llamadas.
+    """
+    perfil = _iniciar_perfil(etapa) if config.PERFIL_ETAPA == etapa else None
+    inicio = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        segundos = time.perf_counter() - inicio
+        if perfil:
+            perfil()
+        observar("etapa_segundos", segundos, etapa=etapa, **etiquetas)
+        if error:
+            contar("etapa_errores_total", etapa=etapa, **etiquetas)
+        if log or config.LOG_SPANS == "todos":
+            rss = rss_max_bytes()
+            fijar("rss_max_bytes", rss)
+            evento("span", etapa=etapa, segundos=round(segundos, 6), rss_max_bytes=rss,
+                   error=error, **etiquetas)
+
+
+def filas(etapa, entrada, salida):
+    """Filas que entran / salen de una etapa; la diferencia cuenta como descartada."""
+    contar("filas_entrada_total", entrada, etapa=etapa)
+    contar("filas_salida_total", salida, etapa=etapa)
+    if entrada > salida:
+        contar("filas_descartadas_total", entrada - salida, etapa=etapa)
+    evento("filas", etapa=etapa, entrada=entrada, salida=salida, descartadas=max(entrada - salida, 0))
+
+
+# -------------------------------
+# Perfilado opt-in (PERFIL_ETAPA / PERFIL_MODO)
+# -------------------------------
+def _ruta_perfil(etapa, extension):
+    os.makedirs(config.PERFIL_DIR, exist_ok=True)
+    return os.path.join(config.PERFIL_DIR, f"{etapa}_{int(time.time())}.{extension}")
+
+
+def _iniciar_perfil(etapa):
+    if config.PERFIL_MODO == "muestreo":
+        muestreador = _Muestreador(threading.get_ident(), config.PERFIL_INTERVALO_MS / 1000)
+        muestreador.start()
+
+        def terminar():
+            ruta = _ruta_perfil(etapa, "folded")
+            muestreador.detener(ruta)
+            evento("perfil", etapa=etapa, modo="muestreo", archivo=ruta, muestras=muestreador.muestras)
+        return terminar
+
+    perfil = cProfile.Profile()
+    perfil.enable()
+
+    def terminar():
+        perfil.disable()
+        ruta = _ruta_perfil(etapa, "prof")
+        perfil.dump_stats(ruta)
+        resumen = io.StringIO()
+        pstats.Stats(perfil, stream=resumen).sort_stats("cumulative").print_stats(15)
+        evento("perfil", etapa=etapa, modo="cprofile", archivo=ruta, top=resumen.getvalue())
+    return terminar
+
+
+class _Muestreador(threading.Thread):
+    """Muestrea la pila del hilo medido cada ``intervalo`` s (estilo py-spy).
+
+    Escribe pilas colapsadas (``a;b;c N``), listas para flamegraph.pl o speedscope.
+    """
+
+    def __init__(self, hilo, intervalo):
+        super().__init__(name="perfil-muestreo", daemon=True)
+        self.hilo = hilo
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self.muestras = 0
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self.hilo)
+            if frame is None:
+                continue
+            pila = ";".join(f"{f.name} ({os.path.basename(f.filename)}:{f.lineno})"
+                            for f in traceback.extract_stack(frame))
+            self.pilas[pila] += 1
+            self.muestras += 1
+
+    def detener(self, ruta):
+        self._parar.set()
+        self.join()
+        with open(ruta, "w", encoding="utf-8") as f:
+            for pila, n in self.pilas.most_common():
+                f.write(f"{pila} {n}\n")
+
+
+# -------------------------------
+# Exportación
+# -------------------------------
+def _escapar(valor):
+    # Formato de texto de Prometheus: \\, \" y \n dentro de los valores
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(etiquetas, extra=()):
+    pares = list(etiquetas) + list(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+
+def exportar_prometheus():
+    fijar("rss_max_bytes", rss_max_bytes())
+    lineas = []
+    with _lock:
+        for tipo, datos in (("counter", _contadores), ("gauge", _medidores)):
+            vistos = set()
+            for (nombre, etiquetas), valor in sorted(datos.items()):
+                if nombre not in vistos:
+                    lineas.append(f"# TYPE {PREFIJO}_{nombre} {tipo}")
+                    vistos.add(nombre)
+                lineas.append(f"{PREFIJO}_{nombre}{_etiquetas(etiquetas)} {valor}")
+
+        vistos = set()
+        for (nombre, etiquetas), h in sorted(_histogramas.items()):
+            completo = f"{PREFIJO}_{nombre}"
+            if nombre not in vistos:
+                lineas.append(f"# TYPE {completo} histogram")
+                vistos.add(nombre)
+            for limite, n in zip(CUBETAS, h):
+                lineas.append(f"{completo}_bucket{_etiquetas(etiquetas, [('le', limite)])} {n}")
+            lineas.append(f"{completo}_bucket{_etiquetas(etiquetas, [('le', '+Inf')])} {h[-1]}")
+            lineas.append(f"{completo}_sum{_etiquetas(etiquetas)} {h[-2]}")
+            lineas.append(f"{completo}_count{_etiquetas(etiquetas)} {h[-1]}")
+    return "\n".join(lineas) + "\n"
+
+
+def resumen():
+    """Foto de todas las métricas, para el evento JSON al final de un batch."""
+    with _lock:
+        return {
+            "contadores": {f"{n}{_etiquetas(e)}": v for (n, e), v in _contadores.items()},
+            "medidores": {f"{n}{_etiquetas(e)}": v for (n, e), v in _medidores.items()},
+            "etapas": {f"{n}{_etiquetas(e)}": {"segundos": round(h[-2], 6), "llamadas": h[-1]}
+                       for (n, e), h in _histogramas.items()},
+        }
+
+
+def registrar_resumen(proceso):
+    evento("resumen_metricas", proceso=proceso, rss_max_bytes=rss_max_bytes(), **resumen())
@@ -0,0 +1,31 @@
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from . import metricas
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(metricas.exportar_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+def instrumentar(app):
+    """Añade /metrics y la latencia por ruta a una app FastAPI."""
+
+    @app.middleware("http")
+    async def medir_peticiones(request: Request, call_next):
+        inicio = time.perf_counter()
+        respuesta = await call_next(request)
+        # Plantilla de la ruta (/insights/messages), no la URL: evita cardinalidad infinita
+        ruta = getattr(request.scope.get("route"), "path", "sin_ruta")
+        metricas.observar("http_segundos", time.perf_counter() - inicio,
+                          ruta=ruta, metodo=request.method)
+        metricas.contar("http_peticiones_total", ruta=ruta, metodo=request.method,
+                        codigo=respuesta.status_code)
+        return respuesta
+
+    app.include_router(router)
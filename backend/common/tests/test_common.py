@@ -0,0 +1,29 @@
+# Tests for common (correr desde backend/: python -m pytest)
+from common import metricas
+from common.ids import id_mensaje
+
+
+def test_etiquetas_prometheus_escapadas():
+    metricas.contar("prueba_escape_total", ruta='/a"b\\c\nd')
+    linea = next(l for l in metricas.exportar_prometheus().splitlines()
+                 if l.startswith("p60_prueba_escape_total{"))
+    assert linea == 'p60_prueba_escape_total{ruta="/a\\"b\\\\c\\nd"} 1.0'
+
+
+def test_spans_por_llamada_no_van_al_log(monkeypatch):
+    eventos = []
+    monkeypatch.setattr(metricas, "evento", lambda nombre, **campos: eventos.append(campos))
+
+    with metricas.medir("prueba_llamada", log=False):
+        pass
+    with metricas.medir("prueba_etapa"):
+        pass
+
+    assert [e["etapa"] for e in eventos] == ["prueba_etapa"]
+    cuentas = metricas.resumen()["etapas"]
+    assert cuentas['etapa_segundos{etapa="prueba_llamada"}']["llamadas"] == 1
+
+
+def test_id_mensaje_estable():
+    assert id_mensaje("2024-01-01", "08:00", "hola") == id_mensaje("2024-01-01", "08:00", "hola")
+    assert len(id_mensaje("2024-01-01", "08:00", "hola")) == 16
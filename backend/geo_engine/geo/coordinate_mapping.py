@@ -2,24 +2,31 @@
 # Prueba NER + Localizaciones específicas + Sentimiento
 # ==========================================================
 
-from flair.data import Sentence
-from flair.models import SequenceTagger
-from flair.nn import Classifier
+from nlp_processor.app.nlp import idiomas
+from nlp_processor.app.nlp.Flair4 import extraer_localizaciones, puntuar_sentimiento
 
 # -------------------------------
-# 1. Cargar modelos
+# 1. Modelos
 # -------------------------------
-tagger_es = SequenceTagger.load("flair/ner-spanish-large")  # NER español
-tagger_de = SequenceTagger.load("de-ner-large")             # NER alemán
-sentiment_model = Classifier.load('sentiment')             # Sentimiento general
+# NER español / alemán y sentimiento se cargan al primer uso (ver nlp/modelos.py)
 
 # -------------------------------
-# 2. Diccionario de lugares/metrostaciones
+# 2. Diccionario de lugares/metrostaciones (GAZETTEER de cada pack de idioma)
 # -------------------------------
-metro_stations = [
-    "Indios Verdes", "Pantitlán", "Zócalo", "Coyoacán", "Metro", "Bellas Artes",
-    "Tacuba", "Centro Médico", "Revolución", "Insurgentes"
-]
+metro_stations = idiomas.pack("E").GAZETTEER
+
+
+def detectar_localizaciones(text, lang):
+    # NER con Flair
+    loc_entities = extraer_localizaciones(text, lang)
+
+    # Buscar estaciones / lugares específicos en el diccionario
+    pack = idiomas.pack(lang)
+    detected_stations = [s for s in (pack.GAZETTEER if pack else []) if s in text]
+
+    # Combinar localizaciones detectadas
+    return list(set(loc_entities + detected_stations))  # set para evitar duplicados
+
 
 # -------------------------------
 # 3. Tweets de prueba
@@ -34,35 +41,15 @@ tweets = [
 # -------------------------------
 # 4. Iterar sobre tweets
 # -------------------------------
-for tweet in tweets:
-    text = tweet["text"]
-    lang = tweet["lang"]
-
-    # 4a. NER con Flair
-    sentence = Sentence(text)
-    if lang.upper() == "E":
-        tagger_es.predict(sentence)
-    else:
-        tagger_de.predict(sentence)
-
-    loc_entities = [entity.text for entity in sentence.get_spans('ner') if entity.get_label('ner').value == "LOC"]
-
-    # 4b. Buscar estaciones / lugares específicos en el diccionario
-    detected_stations = [s for s in metro_stations if s in text]
-
-    # 4c. Combinar localizaciones detectadas
-    all_locations = list(set(loc_entities + detected_stations))  # set para evitar duplicados
+if __name__ == "__main__":
+    for tweet in tweets:
+        text = tweet["text"]
+        lang = tweet["lang"]
 
-    # 4d. Sentimiento
-    sentiment_sentence = Sentence(text)
-    sentiment_model.predict(sentiment_sentence)
-    label = sentiment_sentence.labels[0].value
-    score = sentiment_sentence.labels[0].score
-    if label == "NEGATIVE":
-        score = -score
+        all_locations = detectar_localizaciones(text, lang)
+        label, score = puntuar_sentimiento(text)
 
-    # 4e. Imprimir resultados
-    print(f"Tweet: {text}")
-    print(f"Localizaciones detectadas: {', '.join(all_locations) if all_locations else 'Ninguna'}")
-    print(f"Sentimiento: {label}, Puntaje: {score:.3f}")
-    print("-" * 50)
+        print(f"Tweet: {text}")
+        print(f"Localizaciones detectadas: {', '.join(all_locations) if all_locations else 'Ninguna'}")
+        print(f"Sentimiento: {label}, Puntaje: {score:.3f}")
+        print("-" * 50)
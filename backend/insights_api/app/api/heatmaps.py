@@ -1 +1,19 @@
 # Heatmap endpoint
+from fastapi import APIRouter, Query
+
+from ..db import postgis
+
+router = APIRouter()
+
+
+@router.get("/points")
+def points(
+    min_lon: float,
+    min_lat: float,
+    max_lon: float,
+    max_lat: float,
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    # Puntos dentro de la caja visible del mapa (índice espacial).
+    # Solo devuelve mensajes con Lon/Lat: el pipeline todavía no geocodifica.
+    return postgis.mensajes_en_caja(min_lon, min_lat, max_lon, max_lat, limit)
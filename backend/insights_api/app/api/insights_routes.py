@@ -1,15 +1,24 @@
-from fastapi import APIRouter
-import pandas as pd
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from ..db import postgis
 
 router = APIRouter()
 
 @router.get("/summary")
 def summary():
-    df = pd.read_csv("data/clusters.csv")
-
-    return {
-        "total_messages": len(df),
-        "topics": int(df["topic"].nunique()),
-        "clusters": int(df["cluster"].nunique()),
-        "sample": df.head(5).to_dict(orient="records")
-    }
+    return postgis.resumen()
+
+
+@router.get("/messages")
+def messages(
+    topic: Optional[int] = None,
+    cluster: Optional[int] = None,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    # Búsqueda indexada por fecha / topic / cluster
+    return postgis.buscar_mensajes(topic, cluster, desde, hasta, limit)
@@ -1 +1,64 @@
-# Topics endpoint
+# Topics endpoint: snapshot precalculado para el bubble chart
+import gzip
+import json
+import zlib
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from ..db import snapshots
+
+router = APIRouter()
+
+
+def _responder(request, cuerpo, cuerpo_gz, etag):
+    # ETag fuerte distinto por representación (RFC 9110): un caché compartido
+    # no debe responder un If-None-Match con la otra codificación
+    comprimido = "gzip" in request.headers.get("accept-encoding", "")
+    if comprimido:
+        etag = etag[:-1] + '-gz"'
+    cabeceras = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=cabeceras)
+    if comprimido:
+        return Response(cuerpo_gz, media_type="application/json",
+                        headers={**cabeceras, "Content-Encoding": "gzip"})
+    return Response(cuerpo, media_type="application/json", headers=cabeceras)
+
+
+def _vigente():
+    version = snapshots.ultima_version()
+    if version is None:
+        raise HTTPException(status_code=404, detail="No hay snapshot de topics publicado")
+    return version
+
+
+@router.get("/snapshot")
+def snapshot(request: Request):
+    version = _vigente()
+    datos = snapshots.cuerpo(version)
+    if datos is None:
+        raise HTTPException(status_code=404, detail=f"Snapshot v{version} no encontrado")
+    # crc del cuerpo: tras reiniciar el directorio vN puede ser otro snapshot
+    return _responder(request, *datos, etag=f'"v{version}-{zlib.crc32(datos[0]):08x}"')
+
+
+@lru_cache(maxsize=32)
+def _delta_serializado(desde, version, huella, actual):
+    # ``actual``: hash de la versión vigente, para no servir un delta de un directorio anterior
+    cuerpo = json.dumps(snapshots.delta(desde, version, huella), ensure_ascii=False,
+                        separators=(",", ":")).encode("utf-8")
+    return cuerpo, gzip.compress(cuerpo)
+
+
+@router.get("/delta")
+def delta(request: Request, desde: int = Query(..., ge=0), hash: Optional[str] = None):
+    # Cambios desde la versión (y hash) que ya tiene el cliente; si no se
+    # puede calcular (versión borrada, posterior a la vigente...) va el snapshot completo
+    version = _vigente()
+    vigente = snapshots.leer(version)
+    if vigente is None:
+        raise HTTPException(status_code=404, detail=f"Snapshot v{version} no encontrado")
+    datos = _delta_serializado(desde, version, hash, vigente["hash"])
+    return _responder(request, *datos, etag=f'"v{desde}-{(hash or "")[:12]}-{vigente["hash"][:12]}"')
@@ -1 +1,247 @@
 # PostGIS wrapper
+# ==========================================================
+# Esquema, carga masiva y consultas de los resultados del pipeline
+# ==========================================================
+import csv
+import io
+
+from common.ids import id_mensaje
+
+from .sql_db import get_db
+
+TABLA = "mensajes"
+
+# -------------------------------
+# Columnas: CSV del pipeline -> tabla
+# -------------------------------
+COLUMNAS = {
+    "ID": "id",
+    "Fecha": "fecha",
+    "Hora": "hora",
+    "Likes": "likes",
+    "Lang": "lang",
+    "Fuente": "fuente",
+    "Tweet_Limpio_Bruto": "tweet_bruto",
+    "Tweet_limpio": "tweet_limpio",
+    "Procesado": "procesado",
+    "BERTopic_Topic": "topic",
+    "BERTopic_Prob": "topic_prob",
+    "SemAxis_Score": "semaxis_score",
+    "Cluster_SemAxis": "cluster",
+    "SentimentScore": "sentiment_score",
+    "Locations": "locations",
+    "Lon": "lon",
+    "Lat": "lat",
+}
+
+_TIPOS = {
+    "id": ("TEXT PRIMARY KEY", "TEXT PRIMARY KEY"),
+    "fecha": ("TIMESTAMP", "TEXT"),
+    "hora": ("TEXT", "TEXT"),
+    "likes": ("INTEGER", "INTEGER"),
+    "lang": ("TEXT", "TEXT"),
+    "fuente": ("TEXT", "TEXT"),
+    "tweet_bruto": ("TEXT", "TEXT"),
+    "tweet_limpio": ("TEXT", "TEXT"),
+    "procesado": ("TEXT", "TEXT"),
+    "topic": ("INTEGER", "INTEGER"),
+    "topic_prob": ("DOUBLE PRECISION", "REAL"),
+    "semaxis_score": ("DOUBLE PRECISION", "REAL"),
+    "cluster": ("INTEGER", "INTEGER"),
+    "sentiment_score": ("DOUBLE PRECISION", "REAL"),
+    "locations": ("TEXT", "TEXT"),
+    "lon": ("DOUBLE PRECISION", "REAL"),
+    "lat": ("DOUBLE PRECISION", "REAL"),
+}
+CAMPOS = list(_TIPOS)
+
+
+# -------------------------------
+# Esquema + índices
+# -------------------------------
+def crear_esquema(db=None):
+    db = db or get_db()
+    pos = 0 if db.motor == "postgres" else 1
+    columnas = ",\n    ".join(f"{c} {_TIPOS[c][pos]}" for c in CAMPOS)
+
+    if db.motor == "postgres":
+        db.ejecutar("CREATE EXTENSION IF NOT EXISTS postgis")
+        columnas += ",\n    geom geometry(Point, 4326)"
+    db.ejecutar(f"CREATE TABLE IF NOT EXISTS {TABLA} (\n    {columnas}\n)")
+
+    for col in ("fecha", "topic", "cluster"):
+        db.ejecutar(f"CREATE INDEX IF NOT EXISTS idx_{TABLA}_{col} ON {TABLA} ({col})")
+    db.ejecutar(f"CREATE INDEX IF NOT EXISTS idx_{TABLA}_topic_fecha ON {TABLA} (topic, fecha)")
+
+    if db.motor == "postgres":
+        db.ejecutar(f"CREATE INDEX IF NOT EXISTS idx_{TABLA}_geom ON {TABLA} USING GIST (geom)")
+    elif db.espacial:
+        # En una base nueva geometry_columns aún no existe: se crea antes de consultarla
+        metadatos = db.consultar(
+            "SELECT 1 AS x FROM sqlite_master WHERE type = 'table' AND name = 'geometry_columns'"
+        )
+        if not metadatos:
+            db.ejecutar("SELECT InitSpatialMetadata(1)")
+        existe = db.consultar(
+            "SELECT 1 AS x FROM geometry_columns WHERE f_table_name = %(t)s", {"t": TABLA}
+        )
+        if not existe:
+            db.ejecutar(f"SELECT AddGeometryColumn('{TABLA}', 'geom', 4326, 'POINT', 'XY')")
+            db.ejecutar(f"SELECT CreateSpatialIndex('{TABLA}', 'geom')")
+    else:
+        # Sin SpatiaLite: índice compuesto sobre lon/lat para las cajas
+        db.ejecutar(f"CREATE INDEX IF NOT EXISTS idx_{TABLA}_lonlat ON {TABLA} (lon, lat)")
+
+
+# -------------------------------
+# Carga masiva (append, sin reescribir)
+# -------------------------------
+def _normalizar(df):
+    if "ID" not in df.columns:
+        # El ID se calcula sobre el Tweet original (como cleaner1 y pipeline_paralelo);
+        # con el texto ya limpio saldría otro ID para el mismo mensaje
+        if "Tweet" not in df.columns:
+            raise ValueError("El CSV no trae columna ID ni Tweet: córrelo por cleaner1 primero")
+        df = df.assign(ID=[id_mensaje(f, h, t) for f, h, t in zip(df["Fecha"], df["Hora"], df["Tweet"])])
+    df = df.rename(columns=COLUMNAS)
+    for col in CAMPOS:
+        if col not in df.columns:
+            df[col] = None
+    df = df[CAMPOS].drop_duplicates(subset="id")
+    return df.astype(object).where(df.notna(), None)
+
+
+def _copy_postgres(db, df):
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_MINIMAL)
+    buffer.seek(0)
+    lista = ", ".join(CAMPOS)
+    with db.conexion() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"CREATE TEMP TABLE staging_{TABLA} "
+            f"(LIKE {TABLA} INCLUDING DEFAULTS EXCLUDING CONSTRAINTS) ON COMMIT DROP"
+        )
+        cur.copy_expert(f"COPY staging_{TABLA} ({lista}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cur.execute(
+            f"INSERT INTO {TABLA} ({lista}, geom) "
+            f"SELECT {lista}, CASE WHEN lon IS NOT NULL AND lat IS NOT NULL "
+            f"THEN ST_SetSRID(ST_MakePoint(lon, lat), 4326) END "
+            f"FROM staging_{TABLA} ON CONFLICT (id) DO NOTHING"
+        )
+        insertados = cur.rowcount
+        cur.close()
+    return insertados
+
+
+def _insert_sqlite(db, df):
+    columnas = ", ".join(CAMPOS)
+    valores = ", ".join(f":{c}" for c in CAMPOS)
+    if db.espacial:
+        columnas += ", geom"
+        valores += ", MakePoint(:lon, :lat, 4326)"
+    consulta = f"INSERT OR IGNORE INTO {TABLA} ({columnas}) VALUES ({valores})"
+    with db.conexion() as conn:
+        antes = conn.total_changes
+        conn.executemany(consulta, df.to_dict(orient="records"))
+        return conn.total_changes - antes
+
+
+def cargar_dataframe(df, db=None):
+    """Inserta los resultados del pipeline; los IDs ya cargados se ignoran."""
+    db = db or get_db()
+    df = _normalizar(df)
+    if df.empty:
+        return 0
+    if db.motor == "postgres":
+        return _copy_postgres(db, df)
+    return _insert_sqlite(db, df)
+
+
+def cargar_csv(ruta, tamano_lote=50_000, db=None):
+    """Carga un CSV del pipeline por bloques, sin leerlo entero en memoria."""
+    import pandas as pd
+
+    db = db or get_db()
+    crear_esquema(db)
+    total = 0
+    for bloque in pd.read_csv(ruta, chunksize=tamano_lote, low_memory=False):
+        total += cargar_dataframe(bloque, db)
+    return total
+
+
+# -------------------------------
+# Consultas parametrizadas
+# -------------------------------
+def resumen(db=None):
+    db = db or get_db()
+    fila = db.consultar(
+        f"SELECT COUNT(*) AS total_messages, COUNT(DISTINCT topic) AS topics, "
+        f"COUNT(DISTINCT cluster) AS clusters FROM {TABLA}"
+    )[0]
+    fila["sample"] = db.consultar(
+        f"SELECT id, fecha, lang, tweet_limpio, topic, semaxis_score, cluster "
+        f"FROM {TABLA} ORDER BY fecha DESC LIMIT 5"
+    )
+    return fila
+
+
+def _fecha(db, valor):
+    # En SQLite la fecha es TEXT: se compara como "YYYY-MM-DD HH:MM:SS"
+    if db.motor == "sqlite" and hasattr(valor, "isoformat"):
+        return valor.isoformat(sep=" ")
+    return valor
+
+
+def buscar_mensajes(topic=None, cluster=None, desde=None, hasta=None, limite=100, db=None):
+    db = db or get_db()
+    filtros, params = [], {"limite": limite}
+    if topic is not None:
+        filtros.append("topic = %(topic)s")
+        params["topic"] = topic
+    if cluster is not None:
+        filtros.append("cluster = %(cluster)s")
+        params["cluster"] = cluster
+    if desde is not None:
+        filtros.append("fecha >= %(desde)s")
+        params["desde"] = _fecha(db, desde)
+    if hasta is not None:
+        filtros.append("fecha < %(hasta)s")
+        params["hasta"] = _fecha(db, hasta)
+    where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    return db.consultar(
+        f"SELECT id, fecha, hora, lang, tweet_limpio, topic, topic_prob, semaxis_score, "
+        f"cluster, sentiment_score, locations, lon, lat "
+        f"FROM {TABLA} {where} ORDER BY fecha DESC LIMIT %(limite)s",
+        params,
+    )
+
+
+def mensajes_en_caja(min_lon, min_lat, max_lon, max_lat, limite=1000, db=None):
+    """Mensajes geolocalizados dentro de una caja (usa el índice espacial)."""
+    db = db or get_db()
+    params = {"min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon,
+              "max_lat": max_lat, "limite": limite}
+    if db.motor == "postgres":
+        filtro = "geom && ST_MakeEnvelope(%(min_lon)s, %(min_lat)s, %(max_lon)s, %(max_lat)s, 4326)"
+    elif db.espacial:
+        filtro = (
+            f"ROWID IN (SELECT ROWID FROM SpatialIndex WHERE f_table_name = '{TABLA}' "
+            f"AND search_frame = BuildMbr(%(min_lon)s, %(min_lat)s, %(max_lon)s, %(max_lat)s, 4326))"
+        )
+    else:
+        filtro = ("lon BETWEEN %(min_lon)s AND %(max_lon)s "
+                  "AND lat BETWEEN %(min_lat)s AND %(max_lat)s")
+    return db.consultar(
+        f"SELECT id, lon, lat, topic, semaxis_score, cluster FROM {TABLA} "
+        f"WHERE {filtro} LIMIT %(limite)s",
+        params,
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    archivo = sys.argv[1] if len(sys.argv) > 1 else "tweets_clusters_semaxis.csv"
+    n = cargar_csv(archivo)
+    print(f"✅ {n} mensajes nuevos cargados desde {archivo}")
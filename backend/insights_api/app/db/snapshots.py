@@ -0,0 +1,202 @@
+# ==========================================================
+# Snapshot de topics para el frontend (bubble chart)
+# ==========================================================
+# Agregado por topic precalculado al final del pipeline: el navegador
+# descarga unos KB de JSON en vez del CSV completo.
+#
+# Cada publicación escribe topics_vN.json (+ .json.gz) y actualiza ULTIMA.
+# Las versiones son inmutables; solo se publica una nueva si el contenido cambia.
+import gzip
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+
+DIR_SNAPSHOTS = os.getenv("SNAPSHOTS_DIR", "data/snapshots")
+RETENER = int(os.getenv("SNAPSHOTS_RETENER", "20"))
+MUESTRA = 10  # tweets de ejemplo por topic (los que muestra el detalle)
+PUNTERO = "ULTIMA"
+
+
+def _nombre(version):
+    return f"topics_v{version}.json"
+
+
+def _numero(valor):
+    # NaN / vacío -> None (JSON válido)
+    try:
+        valor = float(valor)
+    except (TypeError, ValueError):
+        return None
+    return None if valor != valor else round(valor, 4)
+
+
+def _keywords(valor):
+    if not isinstance(valor, str):
+        return []
+    return [k.strip() for k in re.sub(r"[\[\]'\"]", "", valor).split(",") if k.strip()]
+
+
+# -------------------------------
+# Construcción
+# -------------------------------
+def construir(df):
+    """Agrega el CSV final del pipeline (tweets_clusters_semaxis.csv) por topic."""
+    import pandas as pd
+
+    df = df.copy()
+    for columna in ("Lang", "Fuente", "SentimentScore", "SemAxis_Score", "Cluster_SemAxis",
+                    "BERTopic_Translated_Keywords", "BERTopic_Representative_Tweet_En"):
+        if columna not in df.columns:
+            df[columna] = None
+    df["Lang"] = df["Lang"].fillna("").astype(str).str.strip().str.upper()
+    df["Fuente"] = df["Fuente"].fillna("").astype(str).str.strip().str.upper()
+    df["BERTopic_Topic"] = pd.to_numeric(df["BERTopic_Topic"], errors="coerce").fillna(-1).astype(int)
+    texto = df.get("Tweet_limpio", pd.Series("", index=df.index)).fillna("")
+
+    topics = []
+    for topic, g in df.groupby("BERTopic_Topic", sort=True):
+        clusters = g["Cluster_SemAxis"].dropna().astype(int).value_counts().sort_index()
+        con_texto = g[texto.loc[g.index] != ""].head(MUESTRA)
+        topics.append({
+            "topicId": int(topic),
+            "total": int(len(g)),
+            "langA": int((g["Lang"] == "A").sum()),
+            "langE": int((g["Lang"] == "E").sum()),
+            "avgSentiment": _numero(pd.to_numeric(g["SentimentScore"], errors="coerce").mean()),
+            "avgSemaxis": _numero(pd.to_numeric(g["SemAxis_Score"], errors="coerce").mean()),
+            "clusters": {str(c): int(n) for c, n in clusters.items()},
+            "keywords": _keywords(g["BERTopic_Translated_Keywords"].iloc[0]),
+            "repTweet": g["BERTopic_Representative_Tweet_En"].dropna().iloc[0]
+            if g["BERTopic_Representative_Tweet_En"].notna().any() else "",
+            "tweets": [
+                {"text": t, "sentiment": _numero(s), "lang": l, "fuente": f}
+                for t, s, l, f in zip(texto.loc[con_texto.index], con_texto["SentimentScore"],
+                                      con_texto["Lang"], con_texto["Fuente"])
+            ],
+        })
+
+    return {
+        "stats": {
+            "totalTweets": int(len(df)),
+            "totalCorreos": int((df["Fuente"] == "C").sum()),
+            "totalTweetsSource": int((df["Fuente"] != "C").sum()),
+            "totalAleman": int((df["Lang"] == "A").sum()),
+            "totalEspanol": int((df["Lang"] == "E").sum()),
+        },
+        "topics": topics,
+    }
+
+
+# -------------------------------
+# Publicación (versionada, escritura atómica)
+# -------------------------------
+def ultima_version(directorio=DIR_SNAPSHOTS):
+    try:
+        with open(os.path.join(directorio, PUNTERO), encoding="utf-8") as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _escribir(ruta, contenido):
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(contenido)
+    os.replace(temporal, ruta)
+
+
+def publicar(df, directorio=DIR_SNAPSHOTS):
+    """Publica un snapshot nuevo si cambió; devuelve la versión vigente."""
+    snapshot = construir(df)
+    huella = hashlib.sha1(json.dumps(snapshot, sort_keys=True).encode("utf-8")).hexdigest()
+
+    previa = ultima_version(directorio)
+    anterior = leer(previa, directorio) if previa is not None else None
+    if anterior and anterior["hash"] == huella:
+        return previa
+
+    version = (previa or 0) + 1
+    snapshot = {"version": version, "hash": huella, **snapshot}
+    contenido = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, _nombre(version))
+    _escribir(ruta, contenido)
+    _escribir(ruta + ".gz", gzip.compress(contenido, compresslevel=9))
+    # El puntero va al final: los lectores nunca ven una versión a medias
+    _escribir(os.path.join(directorio, PUNTERO), str(version).encode("utf-8"))
+
+    for viejo in range(1, version - RETENER + 1):
+        for extension in ("", ".gz"):
+            try:
+                os.remove(os.path.join(directorio, _nombre(viejo) + extension))
+            except FileNotFoundError:
+                pass
+    return version
+
+
+def publicar_csv(ruta, directorio=DIR_SNAPSHOTS):
+    import pandas as pd
+
+    return publicar(pd.read_csv(ruta, encoding="utf-8-sig"), directorio)
+
+
+# -------------------------------
+# Lectura (cacheada: las versiones no cambian)
+# -------------------------------
+@lru_cache(maxsize=8)
+def _cuerpo(ruta, mtime):
+    with open(ruta, "rb") as f, open(ruta + ".gz", "rb") as fgz:
+        return f.read(), fgz.read()
+
+
+def cuerpo(version, directorio=DIR_SNAPSHOTS):
+    """(json, json gzip) tal como están en disco, o None si la versión ya no existe."""
+    ruta = os.path.join(directorio, _nombre(version))
+    try:
+        # El mtime en la clave: si se reinicia el directorio, vN puede ser otro archivo
+        return _cuerpo(ruta, os.stat(ruta).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+
+def leer(version, directorio=DIR_SNAPSHOTS):
+    datos = cuerpo(version, directorio)
+    return json.loads(datos[0]) if datos else None
+
+
+def delta(desde, hasta, huella=None, directorio=DIR_SNAPSHOTS):
+    """Topics nuevos o modificados y topics eliminados entre dos versiones.
+
+    Devuelve el snapshot completo (``completo``) si ``desde`` ya no se conserva,
+    es posterior a ``hasta`` o no tiene la ``huella`` que tiene el cliente
+    (directorio reiniciado).
+    """
+    actual = leer(hasta, directorio)
+    previo = leer(desde, directorio) if 0 < desde <= hasta else None
+    if previo is not None and huella and previo["hash"] != huella:
+        previo = None
+    if previo is None:
+        return {"desde": desde, "version": hasta, "hash": actual["hash"], "completo": True,
+                "stats": actual["stats"], "cambiados": actual["topics"], "eliminados": []}
+
+    antes = {t["topicId"]: t for t in previo["topics"]}
+    ahora = {t["topicId"]: t for t in actual["topics"]}
+    return {
+        "desde": desde,
+        "version": hasta,
+        "hash": actual["hash"],
+        "completo": False,
+        "stats": actual["stats"],
+        "cambiados": [t for i, t in ahora.items() if antes.get(i) != t],
+        "eliminados": sorted(set(antes) - set(ahora)),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    archivo = sys.argv[1] if len(sys.argv) > 1 else "tweets_clusters_semaxis.csv"
+    print(f"✅ Snapshot de topics v{publicar_csv(archivo)} publicado en {DIR_SNAPSHOTS}")
@@ -1 +1,26 @@
 # Entry point for Insights API
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from .api.insights_routes import router as insights_router
+from .api.heatmaps import router as heatmaps_router
+from .api.topics import router as topics_router
+from .db.postgis import crear_esquema
+from common import config as config_comun
+from common.metricas_routes import instrumentar
+
+app = FastAPI(title="Insights API")
+instrumentar(app)
+# El bubble chart se sirve desde otro origen (GitHub Pages)
+app.add_middleware(CORSMiddleware, allow_origins=config_comun.CORS_ORIGENES,
+                   allow_methods=["GET"], expose_headers=["ETag"])
+
+
+@app.on_event("startup")
+def init_db():
+    crear_esquema()
+
+
+app.include_router(insights_router, prefix="/insights")
+app.include_router(heatmaps_router, prefix="/heatmaps")
+app.include_router(topics_router, prefix="/topics")
@@ -0,0 +1,139 @@
+# Tests for Insights API (backend SQLite; correr desde backend/: python -m pytest)
+import threading
+from datetime import datetime
+
+import pytest
+
+from insights_api.app.db import postgis
+from insights_api.app.db.sql_db import BaseDatos
+
+
+@pytest.fixture
+def db(tmp_path):
+    return BaseDatos(f"sqlite:///{tmp_path / 'p60.db'}", maximo=2)
+
+
+def _insertar(db, id_, fecha, topic, lon=None, lat=None):
+    db.ejecutar(
+        f"INSERT INTO {postgis.TABLA} (id, fecha, topic, cluster, lon, lat) "
+        f"VALUES (%(id)s, %(fecha)s, %(topic)s, 0, %(lon)s, %(lat)s)",
+        {"id": id_, "fecha": fecha, "topic": topic, "lon": lon, "lat": lat},
+    )
+
+
+def test_crear_esquema_idempotente(db):
+    postgis.crear_esquema(db)
+    postgis.crear_esquema(db)
+    indices = {f["name"] for f in db.consultar("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_mensajes_fecha", "idx_mensajes_topic", "idx_mensajes_topic_fecha"} <= indices
+
+
+def test_crear_esquema_spatialite_en_base_nueva(db):
+    if not db.espacial:
+        pytest.skip("SpatiaLite no disponible")
+    postgis.crear_esquema(db)
+    postgis.crear_esquema(db)
+    assert db.consultar(
+        "SELECT 1 AS x FROM geometry_columns WHERE f_table_name = %(t)s", {"t": postgis.TABLA}
+    )
+
+
+def test_buscar_mensajes_por_fecha_y_topic(db):
+    postgis.crear_esquema(db)
+    _insertar(db, "a", "2024-01-01 08:00", 1)
+    _insertar(db, "b", "2024-02-01 08:00", 1)
+    _insertar(db, "c", "2024-02-01 09:00", 2)
+
+    filas = postgis.buscar_mensajes(topic=1, desde=datetime(2024, 1, 15), db=db)
+    assert [f["id"] for f in filas] == ["b"]
+    filas = postgis.buscar_mensajes(hasta=datetime(2024, 2, 1, 8, 30), db=db)
+    assert {f["id"] for f in filas} == {"a", "b"}
+
+
+def test_mensajes_en_caja(db):
+    postgis.crear_esquema(db)
+    if db.espacial:
+        pytest.skip("la caja con SpatiaLite necesita geom, no solo lon/lat")
+    _insertar(db, "dentro", "2024-01-01", 1, lon=-99.13, lat=19.43)
+    _insertar(db, "fuera", "2024-01-01", 1, lon=16.37, lat=48.21)
+    _insertar(db, "sin_coordenadas", "2024-01-01", 1)
+
+    filas = postgis.mensajes_en_caja(-100, 19, -98, 20, db=db)
+    assert [f["id"] for f in filas] == ["dentro"]
+
+
+def test_pool_agotado_espera_en_vez_de_fallar(db):
+    ocupadas = [db.conexion(), db.conexion()]
+    for c in ocupadas:
+        c.__enter__()
+
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(db.consultar("SELECT 1 AS x")))
+    hilo.start()
+    hilo.join(0.2)
+    assert hilo.is_alive() and not resultado
+
+    ocupadas[0].__exit__(None, None, None)
+    hilo.join(5)
+    ocupadas[1].__exit__(None, None, None)
+    assert resultado == [[{"x": 1}]]
+
+
+def _publicar_a_mano(directorio, version, huella, topics):
+    # Sin pandas: escribe topics_vN.json como lo dejaría snapshots.publicar
+    import gzip
+    import json
+
+    from insights_api.app.db import snapshots
+
+    contenido = json.dumps({"version": version, "hash": huella, "stats": {}, "topics": topics}).encode()
+    (directorio / f"topics_v{version}.json").write_bytes(contenido)
+    (directorio / f"topics_v{version}.json.gz").write_bytes(gzip.compress(contenido))
+    (directorio / snapshots.PUNTERO).write_text(str(version))
+
+
+def test_delta_y_recuperacion_tras_reinicio(tmp_path):
+    from insights_api.app.db import snapshots
+
+    _publicar_a_mano(tmp_path, 1, "h1", [{"topicId": 0, "total": 1}, {"topicId": 1, "total": 1}])
+    _publicar_a_mano(tmp_path, 2, "h2", [{"topicId": 0, "total": 2}])
+
+    d = snapshots.delta(1, 2, "h1", directorio=str(tmp_path))
+    assert not d["completo"] and d["hash"] == "h2"
+    assert d["cambiados"] == [{"topicId": 0, "total": 2}] and d["eliminados"] == [1]
+
+    # Cliente con una versión posterior o de otro directorio: snapshot completo, no 400
+    assert snapshots.delta(5, 2, "h5", directorio=str(tmp_path))["completo"]
+    assert snapshots.delta(1, 2, "otro", directorio=str(tmp_path))["completo"]
+    assert snapshots.delta(0, 2, directorio=str(tmp_path))["completo"]
+
+
+def test_id_igual_al_del_pipeline(db):
+    pd = pytest.importorskip("pandas")
+    from common.ids import id_mensaje
+
+    postgis.crear_esquema(db)
+    crudo = pd.DataFrame({"Fecha": ["2024-01-01"], "Hora": ["08:00"], "Tweet": ["¡El METRO! @x"],
+                          "Tweet_Limpio_Bruto": ["el metro"]})
+    assert postgis.cargar_dataframe(crudo, db) == 1
+    assert db.consultar(f"SELECT id FROM {postgis.TABLA}") == [
+        {"id": id_mensaje("2024-01-01", "08:00", "¡El METRO! @x")}]
+
+    with pytest.raises(ValueError):
+        postgis.cargar_dataframe(crudo.drop(columns=["Tweet"]), db)
+
+
+def test_etag_distinto_con_y_sin_gzip():
+    pytest.importorskip("fastapi")
+    from types import SimpleNamespace
+
+    from insights_api.app.api.topics import _responder
+
+    def pedir(**cabeceras):
+        return _responder(SimpleNamespace(headers=cabeceras), b"{}", b"gz", '"v1-abc"')
+
+    plano, comprimido = pedir(), pedir(**{"accept-encoding": "gzip, br"})
+    assert plano.headers["etag"] == '"v1-abc"' and comprimido.headers["etag"] == '"v1-abc-gz"'
+    # El ETag de una representación no valida la otra
+    assert pedir(**{"if-none-match": '"v1-abc-gz"'}).status_code == 200
+    assert pedir(**{"if-none-match": '"v1-abc-gz"', "accept-encoding": "gzip"}).status_code == 304
@@ -1,14 +1,23 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+from typing import List
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
 
 router = APIRouter(tags=["Clustering"])
 
 
 class DataIn(BaseModel):
-    data: list
+    data: List[float]
+    n_clusters: int = Field(2, ge=1)
 
 
 @router.post("/cluster")
 def cluster(payload: DataIn):
-    # Endpoint de ejemplo: devuelve la cantidad de elementos recibidos
-    return {"n_items": len(payload.data)}
+    # KMeans sobre SemAxis_Score (mismo criterio que el pipeline batch)
+    from clustering_engine.cluster.kmeans_cluster import agrupar_semaxis
+
+    if not payload.data:
+        return {"n_items": 0, "clusters": []}
+    if payload.n_clusters > len(payload.data):
+        raise HTTPException(status_code=422, detail="n_clusters no puede ser mayor que el número de datos")
+    return {"n_items": len(payload.data), "clusters": agrupar_semaxis(payload.data, payload.n_clusters)}
@@ -4,6 +4,8 @@ router = APIRouter(tags=["Geo"])
 
 
 @router.get("/locate")
-def locate_place(q: str):
-    # Endpoint de ejemplo: retorna la query recibida
-    return {"query": q, "location": None}
+def locate_place(q: str, lang: str = "E"):
+    # NER (Flair) + diccionario de estaciones
+    from geo_engine.geo.coordinate_mapping import detectar_localizaciones
+
+    return {"query": q, "locations": detectar_localizaciones(q, lang)}
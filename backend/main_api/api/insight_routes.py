@@ -1,8 +1,11 @@
 from fastapi import APIRouter
-from insights_api.app.api.insights_service import generate_insights
+from insights_api.app.api.insights_routes import router as insights_router
+from insights_api.app.api.heatmaps import router as heatmaps_router
+from insights_api.app.api.topics import router as topics_router
 
 router = APIRouter(prefix="/insights", tags=["Insights"])
 
-@router.get("/")
-def insights():
-    return generate_insights()
+# Mismos endpoints que insights_api, servidos en proceso
+router.include_router(insights_router)
+router.include_router(heatmaps_router, prefix="/heatmaps")
+router.include_router(topics_router, prefix="/topics")
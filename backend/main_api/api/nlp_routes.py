@@ -1,14 +1,40 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from nlp_processor.app.core import config
+from nlp_processor.app.core.microlotes import AgrupadorLotes
+from nlp_processor.app.nlp import idiomas
+from nlp_processor.app.nlp.modelos import huella
+
 router = APIRouter(tags=["NLP"])
 
 
 class TextIn(BaseModel):
     text: str
+    lang: str = "E"
+
+
+def _analizar(items):
+    # Import diferido: los modelos solo se cargan con la primera petición (o el precalentado)
+    from nlp_processor.app.nlp.inferencia import analizar_lote
+
+    return analizar_lote(items)
+
+
+agrupador = AgrupadorLotes(
+    _analizar,
+    max_lote=config.LOTE_MAX,
+    espera_ms=config.LOTE_ESPERA_MS,
+    tam_cache=config.CACHE_INFERENCIA,
+    # Centroides / fraseador nuevos en disco: la caché de resultados se vacía
+    version=huella,
+)
 
 
 @router.post("/process")
-def process_text(payload: TextIn):
-    # Endpoint de ejemplo: devuelve el texto recibido
-    return {"processed_text": payload.text}
+async def process_text(payload: TextIn):
+    lang = payload.lang.strip().upper()
+    if idiomas.pack(lang) is None:
+        raise HTTPException(status_code=422, detail=f"lang debe ser uno de {idiomas.codigos()}")
+    # Peticiones concurrentes se agrupan en un solo lote SBERT/Flair
+    return await agrupador.procesar((payload.text, lang))
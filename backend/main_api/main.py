@@ -1,13 +1,63 @@
+import threading
+
 from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 # Usar imports relativos (esto requiere que `main_api` sea paquete)
 from .api.nlp_routes import router as nlp_router
 from .api.clustering_routes import router as clustering_router
 from .api.geo_routes import router as geo_router
+from .api.insight_routes import router as insight_router
+
+# Solo config + registro de modelos: torch/flair/spaCy no se importan aquí
+from nlp_processor.app.core import config
+from nlp_processor.app.nlp import modelos
+from common import config as config_comun
+from common.metricas_routes import instrumentar
+from insights_api.app.db.postgis import crear_esquema
 
 app = FastAPI(title="Transportation Insight API")
+instrumentar(app)
+# El bubble chart se sirve desde otro origen (GitHub Pages)
+app.add_middleware(CORSMiddleware, allow_origins=config_comun.CORS_ORIGENES,
+                   allow_methods=["GET"], expose_headers=["ETag"])
 
 # Registrar routers (los routers internos no definen prefijos)
 app.include_router(nlp_router, prefix="/nlp")
 app.include_router(clustering_router, prefix="/clustering")
 app.include_router(geo_router, prefix="/geo")
+app.include_router(insight_router)
+
+# -------------------------------
+# Precalentado de modelos + readiness
+# -------------------------------
+estado = {"listo": False, "error": None}
+
+
+def _calentar():
+    try:
+        from nlp_processor.app.nlp.inferencia import calentar
+
+        calentar(config.PRECARGAR_MODELOS)
+        estado["listo"] = True
+    except Exception as e:
+        estado["error"] = repr(e)
+
+
+@app.on_event("startup")
+def arrancar():
+    crear_esquema()
+    # En segundo plano: la API acepta conexiones mientras cargan los modelos
+    threading.Thread(target=_calentar, name="precarga-modelos", daemon=True).start()
+
+
+@app.get("/health", tags=["Health"])
+def health():
+    return {"status": "ok"}
+
+
+@app.get("/ready", tags=["Health"])
+def ready():
+    cuerpo = {"ready": estado["listo"], "models": modelos.cargados(), "error": estado["error"]}
+    return JSONResponse(cuerpo, status_code=200 if estado["listo"] else 503)
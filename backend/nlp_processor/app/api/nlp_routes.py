@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 import csv
-from ..nlp.sentiment3 import analyze_sentiment
-from ..nlp.Emociones4 import extract_topics
+from ..nlp.Flair4 import puntuar_sentimiento
+from ..nlp.BerTopic3 import entrenar_topics
+from ..nlp.embeddings2 import obtener_embeddings
 from ..core.preprocessing import clean_text
 
 router = APIRouter()
@@ -12,7 +13,7 @@ def sentiment_analyze():
     with open("data/raw_data.csv", encoding="utf-8") as f:
         for id_, text, user, timestamp in csv.reader(f):
             clean = clean_text(text)
-            label, score = analyze_sentiment(clean)
+            label, score = puntuar_sentimiento(clean)
             rows.append([id_, clean, label, score, user, timestamp])
 
     with open("data/sentiments.csv", "w", newline="", encoding="utf-8") as f:
@@ -27,7 +28,7 @@ def sentiment_analyze():
 def topic_modeling():
     docs = [row[1] for row in csv.reader(open("data/sentiments.csv", encoding="utf-8"))]
 
-    topics, _ = extract_topics(docs)
+    _, topics, _ = entrenar_topics(docs, obtener_embeddings(docs))
 
     with open("data/topics.csv", "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
@@ -1 +1,35 @@
 # Configuration settings
+import os
+
+# -------------------------------
+# Modelos
+# -------------------------------
+SPACY_ES = os.getenv("SPACY_ES", "es_core_news_sm")
+SPACY_DE = os.getenv("SPACY_DE", "de_core_news_sm")
+SBERT_MODELO = os.getenv("SBERT_MODELO", "paraphrase-multilingual-MiniLM-L12-v2")
+NER_ES = os.getenv("NER_ES", "flair/ner-spanish-large")
+NER_DE = os.getenv("NER_DE", "de-ner-large")
+SENTIMIENTO_MODELO = os.getenv("SENTIMIENTO_MODELO", "sentiment")
+CENTROIDES_TOPICS = os.getenv("CENTROIDES_TOPICS", "topic_centroides.npz")
+
+# Bigramas: modelo con conteos (se actualiza) y fraseador congelado (se aplica)
+MODELO_FRASES = os.getenv("MODELO_FRASES", "modelo_bigramas.phrases")
+FRASEADOR_BIGRAMAS = os.getenv("FRASEADOR_BIGRAMAS", "fraseador_bigramas.phraser")
+FRASES_MIN_COUNT = int(os.getenv("FRASES_MIN_COUNT", "5"))
+FRASES_UMBRAL = float(os.getenv("FRASES_UMBRAL", "10"))
+# Tope de entradas del vocabulario; al superarlo gensim poda los conteos más bajos
+FRASES_MAX_VOCAB = int(os.getenv("FRASES_MAX_VOCAB", "2000000"))
+
+# Modelos que se calientan al arrancar un servicio (vacío = ninguno)
+PRECARGAR_MODELOS = [
+    m for m in os.getenv(
+        "PRECARGAR_MODELOS", "spacy_es,spacy_de,sbert,ner_es,ner_de,sentimiento,centroides_topics,fraseador_bigramas"
+    ).split(",") if m
+]
+
+# -------------------------------
+# Inferencia en línea (micro-lotes)
+# -------------------------------
+LOTE_MAX = int(os.getenv("LOTE_MAX", "32"))
+LOTE_ESPERA_MS = float(os.getenv("LOTE_ESPERA_MS", "5"))
+CACHE_INFERENCIA = int(os.getenv("CACHE_INFERENCIA", "4096"))
@@ -0,0 +1,114 @@
+# ==========================================================
+# Micro-lotes: junta peticiones concurrentes en un solo forward
+# ==========================================================
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AgrupadorLotes:
+    """Acumula claves durante ``espera_ms`` (o hasta ``max_lote``), llama a
+    ``funcion_lote(claves)`` una vez en un hilo aparte y reparte a cada
+    petición su resultado. Los resultados se guardan en una caché LRU.
+
+    ``funcion_lote`` recibe una lista de claves únicas y devuelve una lista
+    de resultados en el mismo orden.
+    """
+
+    def __init__(self, funcion_lote, max_lote=32, espera_ms=5, tam_cache=4096, version=None):
+        self.funcion_lote = funcion_lote
+        self.max_lote = max_lote
+        self.espera = espera_ms / 1000
+        self.tam_cache = tam_cache
+        self.cache = OrderedDict()
+        # version(): valor que cambia cuando los resultados cacheados dejan de valer
+        self.version = version
+        self._version = version() if version else None
+        self._cola = None
+        self._tarea = None
+        self._loop = None
+        # Un solo hilo: los modelos no se llaman en paralelo consigo mismos
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="microlotes")
+
+    async def procesar(self, clave):
+        if self.version:
+            actual = self.version()
+            if actual != self._version:
+                self.cache.clear()
+                self._version = actual
+        if clave in self.cache:
+            self.cache.move_to_end(clave)
+            return self.cache[clave]
+
+        loop = asyncio.get_running_loop()
+        # Cola y tarea van atadas al loop: uno nuevo (otro TestClient, otro asyncio.run) las recrea
+        if self._loop is not loop or self._tarea is None or self._tarea.done():
+            self._loop = loop
+            self._cola = asyncio.Queue()
+            self._tarea = loop.create_task(self._bucle(self._cola))
+
+        futuro = loop.create_future()
+        await self._cola.put((clave, futuro))
+        return await futuro
+
+    async def _juntar(self, cola):
+        loop = asyncio.get_running_loop()
+        lote = [await cola.get()]
+        limite = loop.time() + self.espera
+        while len(lote) < self.max_lote:
+            restante = limite - loop.time()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(cola.get(), restante))
+            except asyncio.TimeoutError:
+                break
+        return lote
+
+    async def _resolver(self, lote):
+        loop = asyncio.get_running_loop()
+        # Textos repetidos dentro del lote se calculan una vez
+        claves = list(dict.fromkeys(clave for clave, _ in lote))
+        try:
+            resultados = await loop.run_in_executor(self._ejecutor, self.funcion_lote, claves)
+            if len(resultados) != len(claves):
+                raise ValueError(f"funcion_lote devolvió {len(resultados)} resultados para {len(claves)} claves")
+        except Exception as e:
+            _fallar(lote, e)
+            return
+
+        por_clave = dict(zip(claves, resultados))
+        for clave, resultado in por_clave.items():
+            self._guardar(clave, resultado)
+        for clave, futuro in lote:
+            if not futuro.done():
+                futuro.set_result(por_clave[clave])
+
+    async def _bucle(self, cola):
+        lote = []
+        try:
+            while True:
+                lote = await self._juntar(cola)
+                await self._resolver(lote)
+                lote = []
+        except BaseException as e:
+            # Nadie queda esperando un futuro que ya no se va a resolver
+            error = e if isinstance(e, Exception) else RuntimeError("micro-lotes detenido")
+            while not cola.empty():
+                lote.append(cola.get_nowait())
+            _fallar(lote, error)
+            raise
+
+    def _guardar(self, clave, resultado):
+        if self.tam_cache <= 0:
+            return
+        self.cache[clave] = resultado
+        self.cache.move_to_end(clave)
+        while len(self.cache) > self.tam_cache:
+            self.cache.popitem(last=False)
+
+
+def _fallar(lote, error):
+    for _, futuro in lote:
+        if not futuro.done():
+            futuro.set_exception(error)
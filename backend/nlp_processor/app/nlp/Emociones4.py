@@ -0,0 +1,116 @@
+# ==========================================
+# Pipeline simplificado: usar embeddings existentes + UMAP opcional + SemAxis + clustering 2 clusters
+# ==========================================
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from common.metricas import filas, medir
+
+from . import idiomas
+from .modelos import obtener
+
+# -------------------------------
+# Configuración
+# -------------------------------
+ARCHIVO_TWEETS = "tweets_bertopic.csv"
+ARCHIVO_EMBEDDINGS = "embeddings_multilingue.npy"
+ARCHIVO_FINAL = "tweets_clusters_semaxis.csv"
+
+# -------------------------------
+# Semillas de emociones (bigramas incluidos)
+# -------------------------------
+# Viven en el pack de cada idioma (nlp/idiomas/); se re-exportan por compatibilidad
+neg_es, pos_es = idiomas.pack("E").SEMILLAS_NEG, idiomas.pack("E").SEMILLAS_POS
+neg_de, pos_de = idiomas.pack("A").SEMILLAS_NEG, idiomas.pack("A").SEMILLAS_POS
+
+# -------------------------------
+# Función SemAxis
+# -------------------------------
+def semaxis_score(embedding_tweet, embedding_neg, embedding_pos):
+    axis = embedding_pos - embedding_neg
+    score = np.dot(embedding_tweet - embedding_neg, axis) / np.dot(axis, axis)
+    return score
+
+
+@lru_cache(maxsize=None)
+def eje_semaxis(lang):
+    """Polos (neg, pos) de un idioma; se codifican una sola vez por proceso."""
+    pack = idiomas.pack(lang)
+    if pack is None:
+        return None
+    modelo = obtener("sbert")
+    # Embeddings de semillas (bigramas se codifican completos)
+    return (modelo.encode(pack.SEMILLAS_NEG, convert_to_numpy=True).mean(axis=0),
+            modelo.encode(pack.SEMILLAS_POS, convert_to_numpy=True).mean(axis=0))
+
+
+def ejes_semaxis():
+    return {codigo: eje_semaxis(codigo) for codigo in idiomas.codigos()}
+
+
+def calcular_semaxis(embeddings, langs):
+    scores = []
+    with medir("semaxis"):
+        for emb, lang in zip(embeddings, langs):
+            eje = eje_semaxis(lang)
+            # Idioma sin pack: sin eje con el que comparar
+            scores.append(semaxis_score(emb, *eje) if eje is not None else float("nan"))
+    return scores
+
+# -------------------------------
+# Ejecución pipeline
+# -------------------------------
+if __name__ == "__main__":
+    import pandas as pd
+    from sklearn.cluster import KMeans
+
+    from .embeddings2 import reducir_umap
+
+    # 1️⃣ Cargar tweets
+    if not os.path.exists(ARCHIVO_TWEETS):
+        raise FileNotFoundError(f"No se encontró {ARCHIVO_TWEETS}")
+    
+    df = pd.read_csv(ARCHIVO_TWEETS)
+    total = len(df)
+    df = df[df["Tweet_limpio"].notna() & (df["Tweet_limpio"] != "")].reset_index(drop=True)
+    filas("filtro_tweet_limpio", total, len(df))
+    print(f"✅ {len(df)} tweets cargados.")
+
+    # 2️⃣ Cargar embeddings existentes
+    if not os.path.exists(ARCHIVO_EMBEDDINGS):
+        raise FileNotFoundError(f"No se encontró {ARCHIVO_EMBEDDINGS}")
+    
+    embeddings_tweets = np.load(ARCHIVO_EMBEDDINGS)
+    print(f"💾 Embeddings cargados desde {ARCHIVO_EMBEDDINGS}")
+
+    # 3️⃣ Reducir con UMAP (opcional)
+    embeddings_umap = reducir_umap(embeddings_tweets)
+
+    # 4️⃣ Calcular SemAxis
+    print("⚡ Calculando SemAxis scores...")
+    semaxis_scores = calcular_semaxis(embeddings_tweets, df["Lang"])
+
+    df["SemAxis_Score"] = semaxis_scores
+
+    # 5️⃣ Clustering 2 clusters sobre SemAxis
+    kmeans = KMeans(n_clusters=2, random_state=42)
+    with medir("clustering"):
+        df["Cluster_SemAxis"] = kmeans.fit_predict(df[["SemAxis_Score"]])
+    print("✅ Clusters SemAxis generados.")
+
+    # 6️⃣ Guardar CSV final
+    df.to_csv(ARCHIVO_FINAL, index=False, encoding='utf-8-sig')
+    print(f"✅ Pipeline completo finalizado. CSV guardado en {ARCHIVO_FINAL}")
+
+    # 7️⃣ Snapshot de topics para el frontend
+    from insights_api.app.db.snapshots import DIR_SNAPSHOTS, publicar
+
+    with medir("snapshot_topics"):
+        version = publicar(df)
+    print(f"📦 Snapshot de topics v{version} publicado en {DIR_SNAPSHOTS}")
+
+    from common.metricas import registrar_resumen
+
+    registrar_resumen("Emociones4")
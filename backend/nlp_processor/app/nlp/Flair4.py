@@ -3,10 +3,10 @@
 # Procesamiento de tweets: NER multilingüe + Sentiment
 # ==========================================================
 
-import pandas as pd
-from flair.data import Sentence
-from flair.models import SequenceTagger
-from flair.nn import Classifier
+from common.metricas import medir
+
+from . import idiomas
+from .modelos import obtener
 
 # -------------------------------
 # 1. Configuración
@@ -14,60 +14,89 @@ from flair.nn import Classifier
 csv_input = "tweets_bertopic.csv"
 csv_output = "tweets_limpios_completos_ner_sentiment.csv"
 
-# Modelos NER
-tagger_es = SequenceTagger.load("flair/ner-spanish-large")
-tagger_de = SequenceTagger.load("de-ner-large")
+# Modelos NER: uno por pack de idioma (se cargan al primer uso)
 
-# Modelo de Sentimiento
-sentiment_model = Classifier.load('sentiment')
 
 # -------------------------------
-# 2. Cargar CSV
+# 2. NER: solo LOC
 # -------------------------------
-df = pd.read_csv(csv_input)
+def extraer_localizaciones_lote(textos, lang):
+    from flair.data import Sentence
+
+    pack = idiomas.pack(lang)
+    if pack is None:
+        return [[] for _ in textos]
+
+    sentences = [Sentence(t) for t in textos]
+    tagger = idiomas.modelo_ner(pack)
+    with medir("flair_ner", log=False, modelo=tagger):
+        obtener(tagger).predict(sentences, mini_batch_size=max(len(sentences), 1))
+
+    return [
+        [entity.text for entity in sentence.get_spans('ner') if entity.get_label('ner').value == "LOC"]
+        for sentence in sentences
+    ]
+
+
+def extraer_localizaciones(text, lang):
+    return extraer_localizaciones_lote([text], lang)[0]
 
-# -------------------------------
-# 3. Iterar sobre tweets
-# -------------------------------
-locations = []
-sentiment_scores = []
-
-for i, row in df.iterrows():
-    text = row["Procesado"]
-    lang = row["Lang"]
-
-    # -----------------------
-    # NER
-    # -----------------------
-    sentence = Sentence(text)
-    if lang.upper() == "E":
-        tagger_es.predict(sentence)
-    else:
-        tagger_de.predict(sentence)
-
-    # Extraer solo LOC
-    loc_entities = [entity.text for entity in sentence.get_spans('ner') if entity.get_label('ner').value == "LOC"]
-    locations.append(", ".join(loc_entities))
-
-    # -----------------------
-    # Sentimiento
-    # -----------------------
-    sentiment_sentence = Sentence(text)
-    sentiment_model.predict(sentiment_sentence)
-    label = sentiment_sentence.labels[0].value
-    score = sentiment_sentence.labels[0].score
-    if label == "NEGATIVE":
-        score = -score  # negativo si la etiqueta es negativa
-    sentiment_scores.append(score)
 
 # -------------------------------
-# 4. Añadir resultados al DataFrame
+# 3. Sentimiento
 # -------------------------------
-df["Locations"] = locations
-df["SentimentScore"] = sentiment_scores
+def puntuar_sentimiento_lote(textos):
+    from flair.data import Sentence
+
+    sentences = [Sentence(t) for t in textos]
+    with medir("flair_sentimiento", log=False, modelo="sentimiento"):
+        obtener("sentimiento").predict(sentences, mini_batch_size=max(len(sentences), 1))
+
+    resultados = []
+    for sentiment_sentence in sentences:
+        if not sentiment_sentence.labels:  # texto vacío
+            resultados.append((None, 0.0))
+            continue
+        label = sentiment_sentence.labels[0].value
+        score = sentiment_sentence.labels[0].score
+        if label == "NEGATIVE":
+            score = -score  # negativo si la etiqueta es negativa
+        resultados.append((label, score))
+    return resultados
+
+
+def puntuar_sentimiento(text):
+    return puntuar_sentimiento_lote([text])[0]
+
+
+def procesar(df):
+    locations = []
+    sentiment_scores = []
+
+    for i, row in df.iterrows():
+        text = row["Procesado"]
+        lang = row["Lang"]
+
+        locations.append(", ".join(extraer_localizaciones(text, lang)))
+        sentiment_scores.append(puntuar_sentimiento(text)[1])
+
+    df["Locations"] = locations
+    df["SentimentScore"] = sentiment_scores
+    return df
+
 
 # -------------------------------
-# 5. Guardar CSV final
+# 4. Ejecución
 # -------------------------------
-df.to_csv(csv_output, index=False)
-print(f"Procesamiento completado. CSV guardado en: {csv_output}")
+if __name__ == "__main__":
+    import pandas as pd
+
+    from common.metricas import registrar_resumen
+
+    df = pd.read_csv(csv_input)
+    with medir("flair"):
+        df = procesar(df)
+    registrar_resumen("Flair4")
+
+    df.to_csv(csv_output, index=False)
+    print(f"Procesamiento completado. CSV guardado en: {csv_output}")
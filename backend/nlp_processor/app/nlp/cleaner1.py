@@ -1,27 +1,31 @@
-import pandas as pd
+import os
 import re
-import spacy
 from collections import Counter
-from gensim.models.phrases import Phrases, Phraser
+from functools import lru_cache
 
-# ============================
-# Cargar datos
-# ============================
-df = pd.read_csv(r"D:\Customer_Happy_Index_Project\backend\nlp_processor\app\nlp\Data\tweets_format.csv")
+from common.ids import id_mensaje
+from common.metricas import filas, medir, registrar_resumen
 
-# ============================
-# MODELOS POR IDIOMA
-# ============================
-nlp_es = spacy.load("es_core_news_sm")
-nlp_de = spacy.load("de_core_news_sm")
+from ..core import config
+from . import idiomas
+from .modelos import obtener, reemplazar
+
+# pandas, spaCy y gensim se importan dentro de las funciones que los usan,
+# así los servicios que solo limpian texto arrancan rápido.
+
+ARCHIVO_ENTRADA = os.path.join(os.path.dirname(__file__), "Data", "tweets_format.csv")
+ARCHIVO_SALIDA = "tweets_limpios_completos.csv"
+MODELO_FRASES = config.MODELO_FRASES
+FRASEADOR_BIGRAMAS = config.FRASEADOR_BIGRAMAS
 
 # ============================
-# STOPWORDS
+# MODELOS Y STOPWORDS POR IDIOMA (ver nlp/idiomas/)
 # ============================
-FRASES_A_ELIMINAR = ["rt", "via"]
-
-STOP_ES = set(nlp_es.Defaults.stop_words).union([x.lower() for x in FRASES_A_ELIMINAR])
-STOP_DE = set(nlp_de.Defaults.stop_words).union([x.lower() for x in FRASES_A_ELIMINAR])
+@lru_cache(maxsize=None)
+def stopwords(lang):
+    pack = idiomas.pack(lang)
+    nlp = obtener(idiomas.modelo_spacy(pack))
+    return set(nlp.Defaults.stop_words).union([x.lower() for x in pack.STOPWORDS_EXTRA])
 
 # ============================
 # ALIAS
@@ -34,7 +38,7 @@ ALIAS = {
 # 1) Limpieza básica
 # ============================
 def limpiar_bruto(t):
-    if pd.isna(t):
+    if not isinstance(t, str):
         return ""
 
     t = re.sub(r'^.*?@\w+.*?\b\d+\s*[mhsMHHS]\b', '', t, flags=re.DOTALL)
@@ -58,15 +62,6 @@ def limpiar_bruto(t):
 
     return t
 
-# Aplicar limpieza básica y guardar en columna separada
-df["Tweet_Limpio_Bruto"] = df["Tweet"].apply(limpiar_bruto)
-
-# Ahora sí, reemplazar "Tweet" por la columna que seguiremos procesando
-df["Tweet_limpio"] = df["Tweet_Limpio_Bruto"]
-
-# Eliminar columna original si quieres
-df = df.drop(columns=["Tweet"])
-
 # ============================
 # 2) Menciones y hashtags
 # ============================
@@ -91,21 +86,16 @@ def unificar_alias(texto):
         texto = re.sub(rf"\b{alias}\b", nombre, texto)
     return texto
 
-df["Tweet_limpio"] = df["Tweet_limpio"].apply(unificar_alias)
-
 # ============================
 # 4) spaCy: stopwords, entidades, lematizar + infinitivo para verbos
 # ============================
 def procesar_spacy(texto, lang):
 
-    if lang == "E":
-        nlp = nlp_es
-        STOP = STOP_ES
-    elif lang == "A":
-        nlp = nlp_de
-        STOP = STOP_DE
-    else:
+    pack = idiomas.pack(lang)
+    if pack is None:
         return ""
+    nlp = obtener(idiomas.modelo_spacy(pack))
+    STOP = stopwords(pack.CODIGO)
 
     doc = nlp(texto)
 
@@ -139,36 +129,151 @@ def procesar_spacy(texto, lang):
 
     return " ".join(tokens_limpios)
 
-df["Procesado"] = df.apply(lambda x: procesar_spacy(x["Tweet_limpio"], x["Lang"]), axis=1)
-
 # ============================
 # 5) BIGRAMAS → reemplazar Tweet_limpio
 # ============================
-def detectar_bigramas(df, columna="Procesado", min_count=5, threshold=10):
-    textos = [t.split() for t in df[columna] if isinstance(t, str)]
-    phrases = Phrases(textos, min_count=min_count, threshold=threshold)
-    bigram_mod = Phraser(phrases)
-
-    nuevos = [" ".join(bigram_mod[t]) for t in textos]
-    df["Tweet_limpio"] = nuevos   
+# El modelo de frases persiste entre corridas: cada corrida solo suma los
+# conteos de los documentos nuevos (add_vocab sobre un iterador) y se congela
+# en un fraseador compacto para aplicarlo. gensim poda el vocabulario cuando
+# pasa de FRASES_MAX_VOCAB, así la memoria queda acotada.
+#
+# El modelo se guarda solo después de escribir la salida: si la corrida falla
+# antes, la siguiente vuelve a sumar esos documentos sobre el modelo sin ellos
+# (y no dos veces).
+def cargar_frases(ruta=MODELO_FRASES, min_count=config.FRASES_MIN_COUNT,
+                  threshold=config.FRASES_UMBRAL):
+    from gensim.models.phrases import Phrases
+
+    if os.path.exists(ruta):
+        return Phrases.load(ruta)
+    return Phrases(min_count=min_count, threshold=threshold,
+                   max_vocab_size=config.FRASES_MAX_VOCAB)
+
+
+def actualizar_frases(documentos, ruta_modelo=MODELO_FRASES,
+                      min_count=config.FRASES_MIN_COUNT, threshold=config.FRASES_UMBRAL):
+    """(frases, fraseador) con los documentos nuevos sumados, sin guardarlos todavía.
+
+    documentos: iterable (se recorre una vez) de listas de tokens nuevas.
+    """
+    frases = cargar_frases(ruta_modelo, min_count, threshold)
+    frases.add_vocab(documentos)
+    return frases, frases.freeze()
+
+
+def _guardar(modelo, ruta):
+    # Escritura atómica: un corte a mitad no deja corrupta la única copia de los conteos
+    temporal = ruta + ".tmp"
+    modelo.save(temporal, separately=[])
+    os.replace(temporal, ruta)
+
+
+def guardar_frases(frases, fraseador, ruta_modelo=MODELO_FRASES, ruta_fraseador=FRASEADOR_BIGRAMAS):
+    _guardar(frases, ruta_modelo)
+    _guardar(fraseador, ruta_fraseador)
+    if ruta_fraseador == FRASEADOR_BIGRAMAS:
+        # La inferencia en línea usa el fraseador recién congelado
+        reemplazar("fraseador_bigramas", fraseador)
+
+
+def aplicar_bigramas(textos, fraseador):
+    if fraseador is None:
+        return [t if isinstance(t, str) else "" for t in textos]
+    return [" ".join(fraseador[t.split()]) if isinstance(t, str) else "" for t in textos]
+
+
+def _bigramas(df, columna, ruta_modelo, min_count=config.FRASES_MIN_COUNT,
+              threshold=config.FRASES_UMBRAL):
+    # df debe traer solo los documentos nuevos: los ya procesados no se tocan
+    documentos = (t.split() for t in df[columna] if isinstance(t, str))
+    frases, fraseador = actualizar_frases(documentos, ruta_modelo, min_count, threshold)
+    df["Tweet_limpio"] = aplicar_bigramas(df[columna], fraseador)
+    return frases, fraseador
+
+
+def detectar_bigramas(df, columna="Procesado", min_count=config.FRASES_MIN_COUNT,
+                      threshold=config.FRASES_UMBRAL, ruta_modelo=MODELO_FRASES,
+                      ruta_fraseador=FRASEADOR_BIGRAMAS):
+    """Aplica bigramas y guarda el modelo enseguida (main lo guarda tras el append)."""
+    frases, fraseador = _bigramas(df, columna, ruta_modelo, min_count, threshold)
+    guardar_frases(frases, fraseador, ruta_modelo, ruta_fraseador)
     return df
 
-df = detectar_bigramas(df)
 
 # ============================
-# Limpiar "and" al inicio o final
+# Ejecución pipeline
 # ============================
-df["Tweet_limpio"] = df["Tweet_limpio"].str.strip()
-df["Tweet_limpio"] = df["Tweet_limpio"].str.replace(r'^(and\s+)|(\s+and)$', '', regex=True)
+def main(archivo_entrada=ARCHIVO_ENTRADA, archivo_salida=ARCHIVO_SALIDA,
+         ruta_modelo=MODELO_FRASES, ruta_fraseador=FRASEADOR_BIGRAMAS):
+    import pandas as pd
+
+    df = pd.read_csv(archivo_entrada)
+    total = len(df)
+
+    # ============================
+    # Marcar fuente (por posición en el archivo de entrada)
+    # ============================
+    df["Fuente"] = ["C" if i < 5000 else "T" for i in range(len(df))]
+
+    # ============================
+    # Solo tweets nuevos: los ya guardados conservan su Tweet_limpio
+    # ============================
+    df["ID"] = [id_mensaje(f, h, t) for f, h, t in zip(df["Fecha"], df["Hora"], df["Tweet"])]
+    df = df.drop_duplicates(subset="ID")
+    existe_salida = os.path.exists(archivo_salida)
+    if existe_salida and "ID" not in pd.read_csv(archivo_salida, nrows=0, encoding="utf-8-sig").columns:
+        print(f"⚠️ {archivo_salida} no tiene columna ID (versión anterior): se regenera completo.")
+        existe_salida = False
+    if existe_salida:
+        previos = pd.read_csv(archivo_salida, usecols=["ID"], encoding="utf-8-sig")["ID"]
+        df = df[~df["ID"].isin(set(previos))].reset_index(drop=True)
+    filas("tweets_nuevos", total, len(df))
+    if df.empty:
+        print("✓ No hay tweets nuevos que limpiar.")
+        return df
+
+    # Aplicar limpieza básica y guardar en columna separada
+    with medir("limpiar_bruto"):
+        df["Tweet_Limpio_Bruto"] = df["Tweet"].apply(limpiar_bruto)
+
+    # Ahora sí, reemplazar "Tweet" por la columna que seguiremos procesando
+    df["Tweet_limpio"] = df["Tweet_Limpio_Bruto"]
+
+    # Eliminar columna original si quieres
+    df = df.drop(columns=["Tweet"])
+
+    with medir("unificar_alias"):
+        df["Tweet_limpio"] = df["Tweet_limpio"].apply(unificar_alias)
+
+    with medir("procesar_spacy"):
+        df["Procesado"] = df.apply(lambda x: procesar_spacy(x["Tweet_limpio"], x["Lang"]), axis=1)
+    # Idiomas sin modelo spaCy quedan vacíos
+    filas("procesar_spacy", len(df), int((df["Procesado"] != "").sum()))
+
+    with medir("detectar_bigramas"):
+        frases, fraseador = _bigramas(df, "Procesado", ruta_modelo)
+
+    # ============================
+    # Limpiar "and" al inicio o final
+    # ============================
+    df["Tweet_limpio"] = df["Tweet_limpio"].str.strip()
+    df["Tweet_limpio"] = df["Tweet_limpio"].str.replace(r'^(and\s+)|(\s+and)$', '', regex=True)
+
+    # ============================
+    # Guardar salida final (append)
+    # ============================
+    if existe_salida:
+        columnas = pd.read_csv(archivo_salida, nrows=0, encoding="utf-8-sig").columns
+        df.reindex(columns=columnas).to_csv(archivo_salida, mode="a", header=False, index=False)
+    else:
+        df.to_csv(archivo_salida, index=False, encoding='utf-8-sig')
+    # Con la salida ya escrita: estos IDs no se volverán a sumar al modelo
+    guardar_frases(frases, fraseador, ruta_modelo, ruta_fraseador)
 
-# ============================
-# Guardar salida final
-# ============================
-# ============================
-# Marcar fuente
-# ============================
-df["Fuente"] = ["C" if i < 5000 else "T" for i in range(len(df))]
+    print("✓ Limpieza completa aplicada (ES + DE) con infinitivos y bigramas en Tweet_limpio. Fuente marcada.")
+    registrar_resumen("cleaner1")
+    return df
 
-df.to_csv("tweets_limpios_completos.csv", index=False, encoding='utf-8-sig')
 
-print("✓ Limpieza completa aplicada (ES + DE) con infinitivos y bigramas en Tweet_limpio. Fuente marcada.")
+if __name__ == "__main__":
+    main()
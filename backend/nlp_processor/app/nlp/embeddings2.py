@@ -1,21 +1,19 @@
 # Embedding generation + HDBSCAN clustering - pipeline completo
 import os
-import pandas as pd
 import numpy as np
-import torch
-from sentence_transformers import SentenceTransformer
-from umap import UMAP
-import hdbscan
 
-print(torch.cuda.is_available())      # Debería imprimir True
-print(torch.cuda.device_count())      # Número de GPUs disponibles
-print(torch.cuda.get_device_name(0))  # Nombre de la primera GPU
+from common.metricas import filas, medir
+
+from ..core import config
+from .modelos import dispositivo, obtener
+
+# pandas, torch, sentence-transformers y UMAP se importan en cada paso
 
 
 # -------------------------------
 # Configuración
 # -------------------------------
-DEFAULT_MODELO = "paraphrase-multilingual-MiniLM-L12-v2"  # SBERT multilingüe
+DEFAULT_MODELO = config.SBERT_MODELO  # SBERT multilingüe
 ARCHIVO_TWEETS = "tweets_limpios_completos.csv"
 ARCHIVO_EMBEDDINGS = "embeddings_multilingue.npy"
 
@@ -24,11 +22,15 @@ ARCHIVO_EMBEDDINGS = "embeddings_multilingue.npy"
 # Paso 1: Cargar tweets
 # -------------------------------
 def cargar_tweets(archivo):
+    import pandas as pd
+
     if not os.path.exists(archivo):
         raise FileNotFoundError(f"❌ No se encontró el archivo {archivo}")
     
     df = pd.read_csv(archivo, low_memory=False)
+    total = len(df)
     df = df[df["Tweet_limpio"].notna() & (df["Tweet_limpio"] != "")].reset_index(drop=True)
+    filas("filtro_tweet_limpio", total, len(df))
     print(f"✅ {len(df)} tweets cargados.")
     return df
 
@@ -36,10 +38,19 @@ def cargar_tweets(archivo):
 # Paso 2: Obtener embeddings con SBERT
 # -------------------------------
 def obtener_embeddings(tweets, modelo_nombre=DEFAULT_MODELO, archivo_salida=None):
-    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    if modelo_nombre == DEFAULT_MODELO:
+        # Compartido con el resto del proceso; el registro ya eligió el device
+        # (y con modelos ligeros no hace falta torch)
+        modelo = obtener("sbert")
+        device = str(getattr(modelo, "device", "cpu"))
+    else:
+        from sentence_transformers import SentenceTransformer
+
+        device = dispositivo()
+        modelo = SentenceTransformer(modelo_nombre, device=device)
     print(f"🧠 Generando embeddings con SBERT ({modelo_nombre}) en {device.upper()}...")
-    modelo = SentenceTransformer(modelo_nombre, device=device)
-    embeddings = modelo.encode(tweets, show_progress_bar=True)
+    with medir("embedding", modelo=modelo_nombre):
+        embeddings = modelo.encode(tweets, show_progress_bar=True)
 
     if archivo_salida:
         np.save(archivo_salida, embeddings)
@@ -64,6 +75,8 @@ def normalizar_embeddings(embeddings):
 # Paso 4: Reducir con UMAP
 # -------------------------------
 def reducir_umap(embeddings, n_components=20, n_neighbors=30, min_dist=0.1):
+    from umap import UMAP
+
     print("🔻 Aplicando UMAP para reducción de dimensionalidad...")
     umap_model = UMAP(
         n_components=n_components,
@@ -71,7 +84,8 @@ def reducir_umap(embeddings, n_components=20, n_neighbors=30, min_dist=0.1):
         min_dist=min_dist,
         metric='cosine'
     )
-    reducidos = umap_model.fit_transform(embeddings)
+    with medir("umap"):
+        reducidos = umap_model.fit_transform(embeddings)
     print(f"📉 Embeddings reducidos a {n_components} dimensiones.")
     return reducidos
 
@@ -81,6 +95,13 @@ def reducir_umap(embeddings, n_components=20, n_neighbors=30, min_dist=0.1):
 # Ejecución del pipeline completo
 # -------------------------------
 if __name__ == "__main__":
+    import torch
+
+    print(torch.cuda.is_available())      # Debería imprimir True
+    print(torch.cuda.device_count())      # Número de GPUs disponibles
+    if torch.cuda.is_available():
+        print(torch.cuda.get_device_name(0))  # Nombre de la primera GPU
+
     # Cargar tweets
     df = cargar_tweets(ARCHIVO_TWEETS)
     tweets = df["Tweet_limpio"].tolist()
@@ -94,3 +115,7 @@ if __name__ == "__main__":
     # Reducir con UMAP
     embeddings_umap = reducir_umap(embeddings_norm)
 
+    from common.metricas import registrar_resumen
+
+    registrar_resumen("embeddings2")
+
@@ -0,0 +1,64 @@
+# ==========================================================
+# Packs de idioma
+# ==========================================================
+# Cada módulo de este paquete describe un idioma (código de la columna Lang,
+# modelos spaCy/NER, stopwords extra, semillas SemAxis y gazetteer). Las
+# etapas consultan el pack en lugar de ramificar por idioma: para añadir
+# un idioma basta con añadir aquí un módulo nuevo con los mismos nombres.
+import importlib
+import pkgutil
+
+from .. import modelos
+
+_PACKS = {}
+
+
+def modelo_spacy(pack):
+    return f"spacy_{pack.NOMBRE}"
+
+
+def modelo_ner(pack):
+    return f"ner_{pack.NOMBRE}"
+
+
+def _fabrica_spacy(nombre):
+    def cargar():
+        import spacy
+
+        return spacy.load(nombre)
+    return cargar
+
+
+def _fabrica_ner(nombre):
+    def cargar():
+        from flair.models import SequenceTagger
+
+        return SequenceTagger.load(nombre)
+    return cargar
+
+
+def registrar(pack):
+    _PACKS[pack.CODIGO] = pack
+    modelos.registrar(modelo_spacy(pack))(_fabrica_spacy(pack.SPACY))
+    modelos.registrar(modelo_ner(pack))(_fabrica_ner(pack.NER))
+
+
+def pack(codigo):
+    """Pack del código de idioma (``"E"``, ``"A"``...) o None si no hay."""
+    if not isinstance(codigo, str):
+        return None
+    return _PACKS.get(codigo.strip().upper())
+
+
+def codigos():
+    return list(_PACKS)
+
+
+def modelos_de(codigo):
+    """Modelos que necesita un trabajador dedicado a este idioma."""
+    p = pack(codigo)
+    return [modelo_spacy(p), modelo_ner(p)] if p else []
+
+
+for _, _nombre, _ in pkgutil.iter_modules(__path__):
+    registrar(importlib.import_module(f"{__name__}.{_nombre}"))
@@ -0,0 +1,46 @@
+# ==========================================================
+# Pack de idioma: alemán (Lang = "A")
+# ==========================================================
+from ...core import config
+
+CODIGO = "A"
+NOMBRE = "de"
+
+# Modelos
+SPACY = config.SPACY_DE
+NER = config.NER_DE
+
+# Stopwords además de las de spaCy
+STOPWORDS_EXTRA = ["rt", "via"]
+
+# -------------------------------
+# Semillas de emociones para SemAxis (bigramas incluidos)
+# -------------------------------
+SEMILLAS_NEG = [
+    "frustration","verspätung","wut","ärger","ärgernis","raub","überfall","unsicher",
+    "angst","teuer","unzufrieden","langsam","schlechter_service","problem","fehler",
+    "mangel","enttäuschung","ausfall","unbequem","schmutzig","laut","überfüllt",
+    "enge","unorganisiert","respektlos","gefährlich","lange_wartezeit","schlechtes_wetter",
+    "schlechte_beschilderung","verwirrung","fehlende_information","ermüdend","rüpelhaft",
+    "unfreundlich","unzuverlässig","chaotisch","stau","konfus","problematisch","verzögerung",
+    "überlastet","ungemütlich","veraltet","unpraktisch","fehlplan","schwierig","unangenehm"
+]
+
+SEMILLAS_POS = [
+    "zufriedenheit","schnell","freude","vertrauen","sicher","günstig","exzellent",
+    "effizient","guter_service","korrekt","lösung","erfolg","verlässlich","angenehm",
+    "glücklich","pünktlich","komfortabel","sauber","ruhig","häufig","gut_beschildert",
+    "organisiert","gut_beleuchtet","barrierefrei","geordnet","freundlicher_service",
+    "gute_frequenz","schnelle_bearbeitung","ohne_verzögerung","problemfrei","fließend",
+    "respektvoll","effektiv","gut_kommuniziert","verständlich","kohärent","praktisch",
+    "angenehme_reise","komfortable_fahrt","ruhige_fahrt","effizienter_fahrplan","sicherer_transport",
+    "sauberkeit","gut_gepflegt","gute_beschilderung","ordnung","ausgezeichneter_service"
+]
+
+# -------------------------------
+# Diccionario de lugares/estaciones
+# -------------------------------
+GAZETTEER = [
+    "Hauptbahnhof", "Westbahnhof", "Praterstern", "Karlsplatz", "Stephansplatz",
+    "Schwedenplatz", "Alexanderplatz", "U-Bahn", "S-Bahn"
+]
@@ -0,0 +1,48 @@
+# ==========================================================
+# Pack de idioma: español (Lang = "E")
+# ==========================================================
+from ...core import config
+
+CODIGO = "E"
+NOMBRE = "es"
+
+# Modelos
+SPACY = config.SPACY_ES
+NER = config.NER_ES
+
+# Stopwords además de las de spaCy
+STOPWORDS_EXTRA = ["rt", "via"]
+
+# -------------------------------
+# Semillas de emociones para SemAxis (bigramas incluidos)
+# -------------------------------
+SEMILLAS_NEG = [
+    "frustración","tardado","enojo","ira","molestia","enfado","robo","asalto",
+    "inseguro","inseguridad","miedo","caro","costoso","insatisfacción","insatisfecho",
+    "lento","mal servicio","deficiente","problema","error","fallo","decepción",
+    "estrés","incidente","atraso","demora","cancelación","incómodo","sucio",
+    "ruidoso","masificado","hacinamiento","desorganizado","falto de respeto",
+    "peligroso","espera larga","clima adverso","mal señalizado","confusión",
+    "desinformación","agotador","incivilidad","mala atención","inexacto",
+    "inconveniente","sobreventa","mal mantenimiento","inseguridad vial","desagradable","frustrante",
+    "perder"
+]
+
+SEMILLAS_POS = [
+    "satisfacción","rápido","alegría","confianza","seguro","barato","excelente",
+    "eficiente","buen servicio","correcto","solución","acierto","confiable",
+    "agradable","éxito","contento","puntual","cómodo","limpio","tranquilo","frecuente",
+    "bien señalizado","organizado","bien iluminado","accesible","ordenado","servicio amable",
+    "buena frecuencia","rápida atención","sin demora","sin problemas","fluido",
+    "respetuoso","efectivo","bien comunicado","entendible","coherente","práctico",
+    "agradable viaje","confortable","tranquilo viaje","eficiente horario","seguro transporte",
+    "limpieza","bien cuidado","buena señalización","orden","excelente atención"
+]
+
+# -------------------------------
+# Diccionario de lugares/metrostaciones
+# -------------------------------
+GAZETTEER = [
+    "Indios Verdes", "Pantitlán", "Zócalo", "Coyoacán", "Metro", "Bellas Artes",
+    "Tacuba", "Centro Médico", "Revolución", "Insurgentes"
+]
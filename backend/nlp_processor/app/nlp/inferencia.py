@@ -0,0 +1,79 @@
+# ==========================================================
+# Inferencia en línea: mismo pipeline que el batch, por lotes pequeños
+# ==========================================================
+import re
+
+import numpy as np
+
+from common.metricas import medir
+
+from .cleaner1 import aplicar_bigramas, limpiar_bruto, procesar_spacy, unificar_alias
+from .Emociones4 import calcular_semaxis, ejes_semaxis
+from .Flair4 import extraer_localizaciones_lote, puntuar_sentimiento_lote
+from .modelos import obtener, precargar
+
+
+def calentar(nombres=None):
+    precargar(nombres)
+    if nombres is None or "sbert" in nombres:
+        ejes_semaxis()
+
+
+def topic_mas_cercano(embeddings):
+    centroides = obtener("centroides_topics")
+    if centroides is None:
+        return [(None, None)] * len(embeddings)
+    ids, matriz = centroides
+    X = np.asarray(embeddings, dtype=float)
+    X = X / np.linalg.norm(X, axis=1, keepdims=True).clip(min=1e-12)
+    similitud = X @ matriz.T
+    mejores = similitud.argmax(axis=1)
+    return [(int(ids[j]), float(similitud[i, j])) for i, j in enumerate(mejores)]
+
+
+def analizar_lote(items):
+    """items: lista de (texto, lang). Devuelve un dict por item, en el mismo orden."""
+    textos = [t for t, _ in items]
+    langs = [lang.upper() for _, lang in items]
+
+    # 1) Limpieza (cleaner1)
+    with medir("limpiar_bruto", log=False, modo="linea"):
+        limpios = [unificar_alias(limpiar_bruto(t)) for t in textos]
+    with medir("procesar_spacy", log=False, modo="linea"):
+        procesados = [procesar_spacy(t, lang) for t, lang in zip(limpios, langs)]
+    # Mismo fraseador congelado que el batch: Tweet_limpio coincide con el CSV
+    frases = [t.strip() for t in aplicar_bigramas(procesados, obtener("fraseador_bigramas"))]
+    frases = [re.sub(r'^(and\s+)|(\s+and)$', '', t) for t in frases]
+
+    # 2) Embeddings + SemAxis (una sola pasada de SBERT para todo el lote)
+    with medir("embedding", log=False, modo="linea"):
+        embeddings = obtener("sbert").encode(frases, batch_size=max(len(frases), 1),
+                                             convert_to_numpy=True)
+    semaxis = calcular_semaxis(embeddings, langs)
+
+    # 3) Flair: sentimiento en un lote, NER en un lote por idioma
+    sentimientos = puntuar_sentimiento_lote(procesados)
+    localizaciones = [[] for _ in items]
+    for lang in set(langs):
+        idx = [i for i, l in enumerate(langs) if l == lang]
+        for i, locs in zip(idx, extraer_localizaciones_lote([procesados[i] for i in idx], lang)):
+            localizaciones[i] = locs
+
+    # 4) Topic más cercano (centroides de BERTopic)
+    topics = topic_mas_cercano(embeddings)
+
+    resultados = []
+    for i in range(len(items)):
+        label, score = sentimientos[i]
+        topic, similitud = topics[i]
+        resultados.append({
+            "clean_text": limpios[i],
+            "processed_text": procesados[i],
+            "phrased_text": frases[i],
+            # NaN no es JSON válido: idioma sin eje -> None
+            "semaxis_score": None if np.isnan(semaxis[i]) else float(semaxis[i]),
+            "sentiment": {"label": label, "score": float(score)},
+            "locations": localizaciones[i],
+            "topic": {"id": topic, "similarity": similitud},
+        })
+    return resultados
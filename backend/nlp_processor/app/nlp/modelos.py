@@ -0,0 +1,141 @@
+# ==========================================================
+# Registro de modelos con carga diferida
+# ==========================================================
+# torch / flair / spaCy / sentence-transformers solo se importan
+# la primera vez que alguien pide el modelo, no al importar el módulo.
+import os
+import threading
+import time
+
+from common import metricas
+
+from ..core import config
+
+_fabricas = {}
+_modelos = {}
+_archivos = {}   # nombre -> archivo del que se carga (se recarga si cambia su mtime)
+_mtimes = {}
+_tiempos_carga = {}
+_locks = {}
+_lock = threading.Lock()
+
+
+def registrar(nombre, archivo=None):
+    def decorador(fabrica):
+        _fabricas[nombre] = fabrica
+        if archivo:
+            _archivos[nombre] = archivo
+        return fabrica
+    return decorador
+
+
+def sustituir(nombre, fabrica):
+    """Reemplaza la fábrica de un modelo (p. ej. modelos ligeros en pruebas)."""
+    with _lock:
+        _fabricas[nombre] = fabrica
+        _archivos.pop(nombre, None)
+        _modelos.pop(nombre, None)
+        _mtimes.pop(nombre, None)
+        _tiempos_carga.pop(nombre, None)
+
+
+def reemplazar(nombre, modelo):
+    """Cambia la instancia en memoria (p. ej. recién guardada a su archivo).
+
+    A diferencia de sustituir(), conserva la fábrica y el archivo registrados:
+    el modelo sigue recargándose por mtime y contando en huella().
+    """
+    with _lock:
+        _modelos[nombre] = modelo
+        _mtimes[nombre] = _mtime(_archivos[nombre]) if nombre in _archivos else None
+
+
+def _mtime(ruta):
+    try:
+        return os.stat(ruta).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def obtener(nombre):
+    ruta = _archivos.get(nombre)
+    mtime = _mtime(ruta) if ruta else None
+    modelo = _modelos.get(nombre)
+    if modelo is not None and _mtimes.get(nombre) == mtime:
+        return modelo
+    with _lock:
+        lock = _locks.setdefault(nombre, threading.Lock())
+    with lock:
+        # Primera carga, o el archivo cambió (p. ej. BERTopic re-entrenado)
+        if nombre not in _modelos or _mtimes.get(nombre) != mtime:
+            inicio = time.perf_counter()
+            with metricas.medir("carga_modelo", modelo=nombre):
+                _modelos[nombre] = _fabricas[nombre]()
+            _mtimes[nombre] = mtime
+            _tiempos_carga[nombre] = time.perf_counter() - inicio
+            metricas.fijar("modelo_carga_segundos", _tiempos_carga[nombre], modelo=nombre)
+    return _modelos[nombre]
+
+
+def precargar(nombres=None):
+    for nombre in list(_fabricas) if nombres is None else nombres:
+        obtener(nombre)
+
+
+def huella():
+    """mtime de los archivos de los que se cargan modelos: cambia al re-generarlos."""
+    return tuple(_mtime(ruta) for _, ruta in sorted(_archivos.items()))
+
+
+def cargados():
+    """Modelos ya en memoria y lo que tardó cada uno en cargar (s)."""
+    return dict(_tiempos_carga)
+
+
+def dispositivo():
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+# -------------------------------
+# Fábricas
+# -------------------------------
+# spaCy y NER (spacy_<idioma>, ner_<idioma>) los registra cada pack de nlp/idiomas/
+@registrar("sbert")
+def _sbert():
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(config.SBERT_MODELO, device=dispositivo())
+
+
+@registrar("sentimiento")
+def _sentimiento():
+    from flair.nn import Classifier
+
+    return Classifier.load(config.SENTIMIENTO_MODELO)
+
+
+@registrar("fraseador_bigramas", archivo=config.FRASEADOR_BIGRAMAS)
+def _fraseador_bigramas():
+    # Generado por cleaner1.detectar_bigramas; sin él no se unen bigramas
+    if not os.path.exists(config.FRASEADOR_BIGRAMAS):
+        return None
+    from gensim.models.phrases import FrozenPhrases
+
+    return FrozenPhrases.load(config.FRASEADOR_BIGRAMAS)
+
+
+@registrar("centroides_topics", archivo=config.CENTROIDES_TOPICS)
+def _centroides_topics():
+    # Generado por BerTopic3; sin él, la inferencia en línea no asigna topic
+    if not os.path.exists(config.CENTROIDES_TOPICS):
+        return None
+    import numpy as np
+
+    datos = np.load(config.CENTROIDES_TOPICS)
+    return datos["topics"], datos["centroides"]
+
+
+# Al final: los packs de idioma registran sus propias fábricas en este módulo
+from . import idiomas  # noqa: E402,F401
@@ -0,0 +1,303 @@
+# ==========================================================
+# Pipeline particionado por idioma y bloque, en un pool de procesos
+# ==========================================================
+# Uso (desde backend/):
+#   python -m nlp_processor.app.nlp.pipeline_paralelo --trabajadores 32
+#
+# Corre las etapas que dependen del idioma (limpieza + spaCy, embeddings,
+# SemAxis, NER y sentimiento). Cada idioma tiene su propio pool: sus
+# trabajadores solo cargan los modelos de ese pack. Los bigramas se
+# actualizan una vez en el proceso padre, entre las dos fases, porque el
+# modelo de frases es global; se guarda recién al final, después del append
+# (la fase 2 lee una copia del fraseador en el directorio de particiones).
+# Las etapas globales (UMAP, BERTopic, KMeans) siguen en sus scripts y leen
+# la salida de este pipeline.
+import argparse
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import lru_cache
+
+import numpy as np
+
+from common.ids import id_mensaje
+from common.metricas import filas, medir, registrar_resumen
+
+from . import idiomas
+from .cleaner1 import (
+    ARCHIVO_ENTRADA, ARCHIVO_SALIDA, FRASEADOR_BIGRAMAS, MODELO_FRASES,
+    actualizar_frases, aplicar_bigramas, guardar_frases, limpiar_bruto, procesar_spacy,
+    unificar_alias,
+)
+from .Emociones4 import calcular_semaxis
+from .embeddings2 import ARCHIVO_EMBEDDINGS
+from .Flair4 import extraer_localizaciones_lote, puntuar_sentimiento_lote
+from .modelos import obtener, precargar
+
+DIR_PARTICIONES = "particiones"
+TAMANO_BLOQUE = 5000
+LOTE_FLAIR = 64
+
+
+# -------------------------------
+# Trabajadores
+# -------------------------------
+def _iniciar_trabajador(codigo, ligeros):
+    # Un hilo de torch por proceso: el paralelismo lo da el pool
+    try:
+        import torch
+
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    if ligeros:
+        from ...benchmarks.modelos_ligeros import instalar
+
+        instalar()
+    precargar(idiomas.modelos_de(codigo))
+
+
+@lru_cache(maxsize=None)
+def _fraseador(ruta):
+    from gensim.models.phrases import FrozenPhrases
+
+    return FrozenPhrases.load(ruta)
+
+
+def _fase_limpieza(codigo, bloque, ruta):
+    bloque["Tweet_Limpio_Bruto"] = bloque["Tweet"].apply(limpiar_bruto)
+    bloque["Tweet_limpio"] = bloque["Tweet_Limpio_Bruto"].apply(unificar_alias)
+    bloque = bloque.drop(columns=["Tweet"])
+    with medir("procesar_spacy", lang=codigo):
+        bloque["Procesado"] = [procesar_spacy(t, codigo) for t in bloque["Tweet_limpio"]]
+    bloque.to_csv(ruta, index=False)
+    return ruta
+
+
+def _fase_modelos(codigo, ruta_entrada, ruta_salida, ruta_fraseador):
+    import pandas as pd
+
+    bloque = pd.read_csv(ruta_entrada, keep_default_na=False, dtype={"Procesado": str})
+
+    # Bigramas con el fraseador que el padre acaba de congelar (copia temporal)
+    limpios = aplicar_bigramas(bloque["Procesado"], _fraseador(ruta_fraseador))
+    bloque["Tweet_limpio"] = pd.Series(limpios).str.strip().str.replace(
+        r'^(and\s+)|(\s+and)$', '', regex=True).values
+
+    # Embeddings + SemAxis (solo filas con texto, como embeddings2.cargar_tweets)
+    con_texto = (bloque["Tweet_limpio"] != "").values
+    textos = bloque.loc[con_texto, "Tweet_limpio"].tolist()
+    with medir("embedding", lang=codigo):
+        embeddings = obtener("sbert").encode(textos, convert_to_numpy=True)
+    bloque["SemAxis_Score"] = np.nan
+    if textos:
+        bloque.loc[con_texto, "SemAxis_Score"] = calcular_semaxis(embeddings, [codigo] * len(textos))
+    np.save(ruta_salida.replace(".csv", ".npy"), embeddings)
+
+    # Flair en mini-lotes
+    procesados = bloque["Procesado"].tolist()
+    localizaciones, sentimientos = [], []
+    for i in range(0, len(procesados), LOTE_FLAIR):
+        parte = procesados[i:i + LOTE_FLAIR]
+        localizaciones += [", ".join(l) for l in extraer_localizaciones_lote(parte, codigo)]
+        sentimientos += [score for _, score in puntuar_sentimiento_lote(parte)]
+    bloque["Locations"] = localizaciones
+    bloque["SentimentScore"] = sentimientos
+
+    bloque.to_csv(ruta_salida, index=False)
+    return ruta_salida
+
+
+# -------------------------------
+# Proceso padre
+# -------------------------------
+def _repartir(trabajadores, conteos):
+    """Trabajadores por idioma, proporcionales a sus filas (mínimo 1, sin pasarse del total)."""
+    total = sum(conteos.values())
+    reparto = {c: max(1, round(trabajadores * n / total)) for c, n in conteos.items()}
+    # El mínimo y el redondeo pueden sumar de más: se le quitan a la partición con más
+    while sum(reparto.values()) > max(trabajadores, len(reparto)):
+        reparto[max(reparto, key=reparto.get)] -= 1
+    return reparto
+
+
+def _esperar(futuros):
+    hechos, _ = wait(futuros)
+    return [f.result() for f in hechos]  # re-lanza el error de un trabajador
+
+
+def _leer_procesado(rutas):
+    import pandas as pd
+
+    for ruta in rutas:
+        for t in pd.read_csv(ruta, usecols=["Procesado"], keep_default_na=False)["Procesado"]:
+            if t:
+                yield t.split()
+
+
+def _unir_columnas(archivo, columnas):
+    """Columnas para el append y filas previas con texto.
+
+    Si el CSV existente (p. ej. de cleaner1.main) no trae las columnas de la
+    fase 2, se reescribe una vez con la unión en vez de descartarlas. Fuera
+    de ese caso solo se leen la cabecera y Tweet_limpio.
+    """
+    import pandas as pd
+
+    actuales = list(pd.read_csv(archivo, nrows=0, encoding="utf-8-sig").columns)
+    faltan = [c for c in columnas if c not in actuales]
+    if faltan:
+        print(f"⚠️ {archivo} no tiene {faltan}: se reescribe con la unión de columnas.")
+        previo = pd.read_csv(archivo, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+        actuales += faltan
+        temporal = archivo + ".tmp"
+        previo.reindex(columns=actuales, fill_value="").to_csv(temporal, index=False, encoding="utf-8-sig")
+        os.replace(temporal, archivo)
+    if "Tweet_limpio" not in actuales:
+        return actuales, 0
+    texto = pd.read_csv(archivo, usecols=["Tweet_limpio"], dtype=str, keep_default_na=False,
+                        encoding="utf-8-sig")["Tweet_limpio"]
+    return actuales, int((texto != "").sum())
+
+
+def ejecutar(archivo_entrada=ARCHIVO_ENTRADA, archivo_salida=ARCHIVO_SALIDA,
+             archivo_embeddings=ARCHIVO_EMBEDDINGS, dir_particiones=DIR_PARTICIONES,
+             trabajadores=None, tamano_bloque=TAMANO_BLOQUE, ligeros=False,
+             ruta_modelo_frases=MODELO_FRASES, ruta_fraseador=FRASEADOR_BIGRAMAS):
+    import pandas as pd
+
+    inicio = time.perf_counter()
+    trabajadores = trabajadores or os.cpu_count()
+
+    df = pd.read_csv(archivo_entrada)
+    total = len(df)
+    df["Fuente"] = ["C" if i < 5000 else "T" for i in range(len(df))]
+    df["ID"] = [id_mensaje(f, h, t) for f, h, t in zip(df["Fecha"], df["Hora"], df["Tweet"])]
+    df = df.drop_duplicates(subset="ID")
+
+    # Solo tweets nuevos (mismo criterio que cleaner1.main)
+    existe_salida = os.path.exists(archivo_salida)
+    if existe_salida and "ID" not in pd.read_csv(archivo_salida, nrows=0, encoding="utf-8-sig").columns:
+        print(f"⚠️ {archivo_salida} no tiene columna ID (versión anterior): se regenera completo.")
+        existe_salida = False
+    if existe_salida:
+        previos = pd.read_csv(archivo_salida, usecols=["ID"], encoding="utf-8-sig")["ID"]
+        df = df[~df["ID"].isin(set(previos))]
+    filas("tweets_nuevos", total, len(df))
+    if df.empty:
+        print("✓ No hay tweets nuevos.")
+        return None
+
+    # Partición por idioma; sin pack solo se limpian aquí (Procesado vacío, como en procesar_spacy)
+    df["_lang"] = [idiomas.pack(l).CODIGO if idiomas.pack(l) else None for l in df["Lang"]]
+    filas("idioma_con_pack", len(df), int(df["_lang"].notna().sum()))
+    particiones = {c: g.drop(columns=["_lang"]) for c, g in df.groupby("_lang")}
+    sin_pack = df[df["_lang"].isna()].drop(columns=["_lang"])
+    sin_pack["Tweet_Limpio_Bruto"] = sin_pack["Tweet"].apply(limpiar_bruto)
+    sin_pack["Tweet_limpio"] = ""
+    sin_pack["Procesado"] = ""
+    sin_pack = sin_pack.drop(columns=["Tweet"])
+    orden = df["ID"].tolist()
+    del df
+
+    shutil.rmtree(dir_particiones, ignore_errors=True)
+    reparto = _repartir(trabajadores, {c: len(g) for c, g in particiones.items()}) if particiones else {}
+    print(f"🧵 Trabajadores por idioma: {reparto}")
+
+    contexto = multiprocessing.get_context("spawn")
+    pools = {
+        c: ProcessPoolExecutor(n, mp_context=contexto, initializer=_iniciar_trabajador,
+                               initargs=(c, ligeros))
+        for c, n in reparto.items()
+    }
+    try:
+        # Fase 1: limpieza + spaCy por idioma y bloque
+        futuros = []
+        for c, grupo in particiones.items():
+            os.makedirs(os.path.join(dir_particiones, "limpieza", f"lang={c}"), exist_ok=True)
+            for k, i in enumerate(range(0, len(grupo), tamano_bloque)):
+                ruta = os.path.join(dir_particiones, "limpieza", f"lang={c}", f"parte-{k:05d}.csv")
+                futuros.append(pools[c].submit(_fase_limpieza, c, grupo.iloc[i:i + tamano_bloque], ruta))
+        with medir("fase_limpieza"):
+            partes = sorted(_esperar(futuros))
+        del particiones
+
+        # Bigramas: una sola actualización global con los documentos nuevos. Si la
+        # fase 2 falla, el modelo guardado no cambia y la próxima corrida no los suma dos veces
+        with medir("detectar_bigramas"):
+            frases, fraseador = actualizar_frases(_leer_procesado(partes), ruta_modelo_frases)
+            fraseador_fase = os.path.join(dir_particiones, os.path.basename(ruta_fraseador))
+            fraseador.save(fraseador_fase)
+
+        # Fase 2: embeddings, SemAxis y Flair por idioma y bloque
+        futuros = []
+        for ruta in partes:
+            c = ruta.split("lang=")[1].split(os.sep)[0]
+            salida = ruta.replace(os.path.join("", "limpieza", ""), os.path.join("", "modelos", ""))
+            os.makedirs(os.path.dirname(salida), exist_ok=True)
+            futuros.append(pools[c].submit(_fase_modelos, c, ruta, salida, fraseador_fase))
+        with medir("fase_modelos"):
+            partes = sorted(_esperar(futuros))
+    finally:
+        for pool in pools.values():
+            pool.shutdown()
+
+    # Merge por ID, en el orden del archivo de entrada
+    with medir("merge"):
+        bloques = [pd.read_csv(r, keep_default_na=False, dtype={"Tweet_limpio": str}) for r in partes]
+        embeddings = [np.load(r.replace(".csv", ".npy")) for r in partes]
+        resultado = pd.concat(bloques + [sin_pack], ignore_index=True)
+        posicion = {id_: i for i, id_ in enumerate(orden)}
+        resultado["_orden"] = resultado["ID"].map(posicion)
+
+        # Embeddings alineados con las filas con texto del CSV final
+        con_texto = resultado["Tweet_limpio"].fillna("") != ""
+        matriz = np.vstack([e for e in embeddings if len(e)]) if any(len(e) for e in embeddings) else None
+        orden_emb = resultado.loc[con_texto, "_orden"].argsort().values
+        resultado = resultado.sort_values("_orden").drop(columns=["_orden"])
+
+        previos_con_texto = 0
+        if existe_salida:
+            columnas, previos_con_texto = _unir_columnas(archivo_salida, resultado.columns)
+            resultado.reindex(columns=columnas).to_csv(archivo_salida, mode="a", header=False, index=False)
+        else:
+            resultado.to_csv(archivo_salida, index=False, encoding="utf-8-sig")
+
+        if matriz is not None:
+            nuevos = matriz[orden_emb]
+            if previos_con_texto:
+                previas = np.load(archivo_embeddings) if os.path.exists(archivo_embeddings) else None
+                if previas is None or len(previas) != previos_con_texto:
+                    # Sin los embeddings de las filas previas no se pueden alinear los nuevos
+                    print(f"⚠️ {archivo_embeddings} no corresponde a {archivo_salida}: "
+                          f"no se actualiza (regenerar con embeddings2).")
+                    nuevos = None
+                else:
+                    nuevos = np.vstack([previas, nuevos])
+            if nuevos is not None:
+                np.save(archivo_embeddings, nuevos)
+
+    # Con la salida ya escrita: estos IDs no se volverán a sumar al modelo
+    guardar_frases(frases, fraseador, ruta_modelo_frases, ruta_fraseador)
+
+    print(f"✅ {len(resultado)} tweets procesados en {time.perf_counter() - inicio:.1f} s "
+          f"con {sum(reparto.values())} procesos. CSV: {archivo_salida}")
+    registrar_resumen("pipeline_paralelo")
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline NLP particionado por idioma")
+    parser.add_argument("--entrada", default=ARCHIVO_ENTRADA)
+    parser.add_argument("--salida", default=ARCHIVO_SALIDA)
+    parser.add_argument("--embeddings", default=ARCHIVO_EMBEDDINGS)
+    parser.add_argument("--particiones", default=DIR_PARTICIONES)
+    parser.add_argument("--trabajadores", type=int, default=None)
+    parser.add_argument("--tamano-bloque", type=int, default=TAMANO_BLOQUE)
+    parser.add_argument("--modelos", choices=["ligeros", "reales"], default="reales")
+    args = parser.parse_args()
+
+    ejecutar(args.entrada, args.salida, args.embeddings, args.particiones,
+             args.trabajadores, args.tamano_bloque, args.modelos == "ligeros")
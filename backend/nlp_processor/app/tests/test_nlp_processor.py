@@ -1 +1,346 @@
-# Tests for NLP Processor
+# Tests for NLP Processor (correr desde backend/: python -m pytest)
+import asyncio
+import os
+import sys
+
+import pytest
+
+from nlp_processor.app.core.microlotes import AgrupadorLotes
+from nlp_processor.app.nlp import modelos
+
+
+# -------------------------------
+# Micro-lotes
+# -------------------------------
+def _mayusculas(claves):
+    return [c.upper() for c in claves]
+
+
+def test_microlotes_agrupa_y_cachea():
+    llamadas = []
+
+    def lote(claves):
+        llamadas.append(list(claves))
+        return _mayusculas(claves)
+
+    ag = AgrupadorLotes(lote, max_lote=8, espera_ms=20)
+
+    async def varias():
+        return await asyncio.gather(*(ag.procesar(c) for c in ["a", "b", "a"]))
+
+    assert asyncio.run(varias()) == ["A", "B", "A"]
+    assert llamadas == [["a", "b"]]
+    assert asyncio.run(ag.procesar("a")) == "A"
+    assert len(llamadas) == 1
+
+
+def test_microlotes_sobrevive_a_un_loop_nuevo():
+    ag = AgrupadorLotes(_mayusculas, espera_ms=1)
+    assert asyncio.run(ag.procesar("x")) == "X"
+    # Antes la cola quedaba atada al primer loop y esto no terminaba
+    assert asyncio.run(asyncio.wait_for(ag.procesar("y"), 2)) == "Y"
+
+
+def test_microlotes_errores_llegan_al_llamador():
+    def falla(claves):
+        raise RuntimeError("modelo caído")
+
+    ag = AgrupadorLotes(falla, espera_ms=1)
+    with pytest.raises(RuntimeError, match="modelo caído"):
+        asyncio.run(asyncio.wait_for(ag.procesar("a"), 2))
+
+    incompleto = AgrupadorLotes(lambda claves: [], espera_ms=1)
+    with pytest.raises(ValueError):
+        asyncio.run(asyncio.wait_for(incompleto.procesar("a"), 2))
+
+
+def test_microlotes_vacia_cache_si_cambia_version():
+    estado = {"version": 1, "sufijo": "1"}
+    ag = AgrupadorLotes(lambda claves: [c + estado["sufijo"] for c in claves],
+                        espera_ms=1, version=lambda: estado["version"])
+    assert asyncio.run(ag.procesar("t")) == "t1"
+    estado.update(version=2, sufijo="2")
+    assert asyncio.run(ag.procesar("t")) == "t2"
+
+
+# -------------------------------
+# Registro de modelos
+# -------------------------------
+def test_modelo_con_archivo_se_recarga_si_cambia(tmp_path):
+    ruta = tmp_path / "centroides.txt"
+    ruta.write_text("v1")
+    modelos.registrar("prueba_archivo", archivo=str(ruta))(lambda: ruta.read_text())
+
+    try:
+        assert modelos.obtener("prueba_archivo") == "v1"
+        ruta.write_text("v2")
+        os.utime(ruta, ns=(0, os.stat(ruta).st_mtime_ns + 1_000_000))
+        assert modelos.obtener("prueba_archivo") == "v2"
+    finally:
+        for registro in (modelos._fabricas, modelos._archivos, modelos._modelos, modelos._mtimes):
+            registro.pop("prueba_archivo", None)
+
+
+def test_reemplazar_conserva_el_archivo_registrado(tmp_path):
+    ruta = tmp_path / "fraseador.txt"
+    ruta.write_text("v1")
+    modelos.registrar("prueba_reemplazo", archivo=str(ruta))(lambda: ruta.read_text())
+
+    try:
+        modelos.reemplazar("prueba_reemplazo", "en memoria")
+        assert modelos.obtener("prueba_reemplazo") == "en memoria"
+        assert "prueba_reemplazo" in modelos._archivos
+        # Sigue recargándose si otro proceso re-genera el archivo
+        ruta.write_text("v2")
+        os.utime(ruta, ns=(0, os.stat(ruta).st_mtime_ns + 1_000_000))
+        assert modelos.obtener("prueba_reemplazo") == "v2"
+    finally:
+        for registro in (modelos._fabricas, modelos._archivos, modelos._modelos, modelos._mtimes):
+            registro.pop("prueba_reemplazo", None)
+
+
+# -------------------------------
+# Bigramas incrementales
+# -------------------------------
+def _rutas_frases(tmp_path):
+    return {"ruta_modelo": str(tmp_path / "frases.model"),
+            "ruta_fraseador": str(tmp_path / "fraseador.model")}
+
+
+def test_detectar_bigramas_suma_conteos_al_modelo_guardado(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("gensim")
+    from nlp_processor.app.nlp.cleaner1 import cargar_frases, detectar_bigramas
+
+    rutas = _rutas_frases(tmp_path)
+    df = pd.DataFrame({"Procesado": ["metro llegar tarde"] * 3 + ["tren limpio"]})
+    detectar_bigramas(df.copy(), min_count=1, threshold=0.1, **rutas)
+    assert cargar_frases(rutas["ruta_modelo"]).vocab["metro"] == 3
+
+    nuevos = detectar_bigramas(pd.DataFrame({"Procesado": ["metro llegar tarde"] * 2}),
+                               min_count=1, threshold=0.1, **rutas)
+    frases = cargar_frases(rutas["ruta_modelo"])
+    assert frases.vocab["metro"] == 5 and frases.vocab["tren"] == 1
+    assert nuevos["Tweet_limpio"].tolist() == ["metro_llegar tarde"] * 2
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+
+def _corpus(tmp_path, nombre, sufijo="", prop_es=0.54):
+    pd = pytest.importorskip("pandas")
+    from nlp_processor.benchmarks.generar_corpus import _RESPALDO, generar
+
+    ruta = generar(40, str(tmp_path / nombre), frases=_RESPALDO, prop_es=prop_es)
+    df = pd.read_csv(ruta, encoding="utf-8-sig")
+    df["Tweet"] = df["Tweet"] + sufijo
+    df.to_csv(ruta, index=False)
+    return df
+
+
+def test_cleaner_solo_procesa_ids_nuevos(tmp_path):
+    pd = pytest.importorskip("pandas")
+    for modulo in ("spacy", "gensim"):
+        pytest.importorskip(modulo)
+    from nlp_processor.app.nlp import cleaner1
+    from nlp_processor.app.nlp.cleaner1 import cargar_frases
+    from nlp_processor.benchmarks.modelos_ligeros import instalar
+
+    instalar()
+    rutas = _rutas_frases(tmp_path)
+    salida = str(tmp_path / "tweets_limpios_completos.csv")
+    primero = _corpus(tmp_path, "entrada1.csv")
+    cleaner1.main(str(tmp_path / "entrada1.csv"), salida, **rutas)
+    antes = pd.read_csv(salida, encoding="utf-8-sig", keep_default_na=False)
+    palabras = cargar_frases(rutas["ruta_modelo"]).corpus_word_count
+
+    # Los mismos 40 mensajes + 40 nuevos: solo estos se limpian y se suman al modelo
+    segundo = pd.concat([primero, _corpus(tmp_path, "extra.csv", " otra vez")])
+    segundo.to_csv(tmp_path / "entrada2.csv", index=False)
+    nuevos = cleaner1.main(str(tmp_path / "entrada2.csv"), salida, **rutas)
+
+    assert len(nuevos) and not set(nuevos["ID"]) & set(antes["ID"])
+    despues = pd.read_csv(salida, encoding="utf-8-sig", keep_default_na=False)
+    pd.testing.assert_frame_equal(despues.head(len(antes)), antes)
+    assert len(despues) == len(antes) + len(nuevos)
+    nuevas = sum(len(t.split()) for t in nuevos["Procesado"] if t)
+    assert cargar_frases(rutas["ruta_modelo"]).corpus_word_count == palabras + nuevas
+
+
+def test_cleaner_no_guarda_el_modelo_si_falla_la_salida(tmp_path):
+    pytest.importorskip("pandas")
+    for modulo in ("spacy", "gensim"):
+        pytest.importorskip(modulo)
+    from nlp_processor.app.nlp import cleaner1
+    from nlp_processor.benchmarks.modelos_ligeros import instalar
+
+    instalar()
+    rutas = _rutas_frases(tmp_path)
+    _corpus(tmp_path, "entrada.csv")
+    with pytest.raises(OSError):
+        cleaner1.main(str(tmp_path / "entrada.csv"), str(tmp_path / "no_existe" / "salida.csv"), **rutas)
+    assert not os.path.exists(rutas["ruta_modelo"])
+
+
+# -------------------------------
+# Benchmarks
+# -------------------------------
+def _corrida(filas, **etapas):
+    # filas_seg de cada etapa; los segundos salen del corpus (filas / filas_seg)
+    return {"filas_corpus": filas, "etapas": {
+        e: {"filas_seg": v, "segundos": filas / v if v else None} for e, v in etapas.items()}}
+
+
+def test_comparar_detecta_solo_caidas_mayores_a_la_tolerancia():
+    from nlp_processor.benchmarks.run_benchmarks import comparar
+
+    base = {"corridas": [_corrida(100, embedding=100.0, semaxis=50.0, flair=10.0)]}
+    actual = {"corridas": [_corrida(100, embedding=70.0, semaxis=45.0, flair=None, umap=1.0),
+                           _corrida(1000, embedding=1.0)]}
+
+    regresiones = comparar(actual, base, tolerancia=0.2, min_segundos=0)
+    assert [(r["etapa"], r["cambio"]) for r in regresiones] == [("embedding", -0.3)]
+
+
+def test_comparar_ignora_etapas_demasiado_cortas():
+    from nlp_processor.benchmarks.run_benchmarks import comparar
+
+    # clustering de 2000 filas en ~40 ms: una caída del 22% es ruido
+    base = {"corridas": [_corrida(2000, clustering=53050.63, bertopic=100.0)]}
+    actual = {"corridas": [_corrida(2000, clustering=41141.24, bertopic=70.0)]}
+    assert [r["etapa"] for r in comparar(actual, base, min_segundos=0.25)] == ["bertopic"]
+
+
+def test_medir_usa_la_mediana_de_las_repeticiones():
+    from nlp_processor.benchmarks.run_benchmarks import _medir
+
+    duraciones = iter([0.05, 0.001, 0.002])
+
+    def etapa():
+        import time
+        time.sleep(next(duraciones))
+
+    r = {}
+    _medir(r, "etapa", 10, etapa, repeticiones=3)
+    assert r["etapa"]["repeticiones"] == 3
+    assert r["etapa"]["segundos"] < 0.04
+
+
+def test_generar_corpus_pequeno(tmp_path):
+    import csv
+
+    from nlp_processor.benchmarks.generar_corpus import COLUMNAS, generar
+
+    frases = {"E": ["el metro llegó tarde otra vez"], "A": ["die bahn war wieder zu spät"]}
+    ruta = generar(50, str(tmp_path / "corpus.csv"), frases=frases)
+    with open(ruta, encoding="utf-8-sig", newline="") as f:
+        filas = list(csv.DictReader(f))
+    assert len(filas) == 50
+    assert list(filas[0]) == COLUMNAS
+    assert {f["Lang"] for f in filas} <= {"E", "A"}
+    # Misma semilla, mismo corpus
+    otra = generar(50, str(tmp_path / "otra.csv"), frases=frases)
+    assert open(otra, "rb").read() == open(ruta, "rb").read()
+
+
+def test_pico_rss_por_etapa():
+    from nlp_processor.benchmarks.run_benchmarks import _medir
+
+    r = {}
+    _medir(r, "pesada", 1, lambda: bytearray(64 * 1024 * 1024)[-1])
+    _medir(r, "ligera", 1, lambda: None)
+    if not r["ligera"]["rss_por_etapa"]:
+        pytest.skip("sin /proc/self/clear_refs: el pico es acumulado")
+    assert r["ligera"]["rss_max_mb"] < r["pesada"]["rss_max_mb"] - 32
+
+
+def test_benchmark_con_modelos_ligeros(tmp_path, monkeypatch):
+    for modulo in ("pandas", "numpy", "spacy", "gensim", "sklearn"):
+        pytest.importorskip(modulo)
+    # Los modelos ligeros no necesitan torch
+    monkeypatch.setitem(sys.modules, "torch", None)
+    from nlp_processor.benchmarks.generar_corpus import _RESPALDO, generar
+    from nlp_processor.benchmarks.modelos_ligeros import instalar
+    from nlp_processor.benchmarks.run_benchmarks import ejecutar
+
+    instalar()
+    ruta = generar(200, str(tmp_path / "corpus.csv"), frases=_RESPALDO)
+    r = ejecutar(ruta, omitir={"umap", "bertopic", "flair"}, repeticiones=2)
+    assert {"limpiar_bruto", "procesar_spacy", "detectar_bigramas", "embedding",
+            "semaxis", "clustering"} <= set(r)
+    assert all(m["filas"] > 0 and m["repeticiones"] == 2 for m in r.values())
+
+
+# -------------------------------
+# Pipeline paralelo
+# -------------------------------
+def test_append_conserva_columnas_de_la_fase_2(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("numpy")
+    from nlp_processor.app.nlp.pipeline_paralelo import _unir_columnas
+
+    # Salida escrita por cleaner1.main: sin SemAxis / Locations / SentimentScore
+    ruta = tmp_path / "tweets_limpios_completos.csv"
+    pd.DataFrame({"ID": ["a", "b"], "Tweet_limpio": ["hola", ""]}).to_csv(
+        ruta, index=False, encoding="utf-8-sig")
+
+    columnas, con_texto = _unir_columnas(str(ruta), ["ID", "Tweet_limpio", "SemAxis_Score", "Locations"])
+    assert columnas == ["ID", "Tweet_limpio", "SemAxis_Score", "Locations"]
+    assert con_texto == 1
+    assert list(pd.read_csv(ruta, nrows=0, encoding="utf-8-sig").columns) == columnas
+
+
+def test_unir_columnas_sin_reescribir_si_ya_estan(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("numpy")
+    from nlp_processor.app.nlp.pipeline_paralelo import _unir_columnas
+
+    ruta = tmp_path / "tweets_limpios_completos.csv"
+    pd.DataFrame({"ID": ["a", "b", "c"], "Tweet_limpio": ["hola", "", "adiós"],
+                  "Locations": ["", "", ""]}).to_csv(ruta, index=False, encoding="utf-8-sig")
+    antes = os.stat(ruta).st_mtime_ns
+
+    assert _unir_columnas(str(ruta), ["Locations", "ID"]) == (["ID", "Tweet_limpio", "Locations"], 2)
+    assert os.stat(ruta).st_mtime_ns == antes
+
+
+def test_repartir_no_pasa_del_total_de_trabajadores():
+    pytest.importorskip("numpy")
+    from nlp_processor.app.nlp.pipeline_paralelo import _repartir
+
+    assert _repartir(4, {"E": 1, "A": 999}) == {"E": 1, "A": 3}
+    assert _repartir(4, {"E": 500, "A": 500}) == {"E": 2, "A": 2}
+    # Cada idioma necesita al menos un proceso, aunque haya más idiomas que trabajadores
+    assert _repartir(1, {"E": 10, "A": 10}) == {"E": 1, "A": 1}
+
+
+def test_pipeline_paralelo_guarda_frases_tras_el_append(tmp_path):
+    pd = pytest.importorskip("pandas")
+    for modulo in ("numpy", "spacy", "gensim"):
+        pytest.importorskip(modulo)
+    from nlp_processor.app.nlp.cleaner1 import cargar_frases
+    from nlp_processor.app.nlp.pipeline_paralelo import ejecutar
+
+    # Un solo idioma: un solo pool que arrancar en cada corrida
+    _corpus(tmp_path, "entrada.csv", prop_es=1.0)
+    rutas = {"ruta_modelo_frases": str(tmp_path / "frases.model"),
+             "ruta_fraseador": str(tmp_path / "fraseador.model")}
+    comunes = {"archivo_embeddings": str(tmp_path / "embeddings.npy"),
+               "dir_particiones": str(tmp_path / "particiones"),
+               "trabajadores": 1, "ligeros": True, **rutas}
+
+    # Falla al escribir la salida: el modelo de frases no se toca
+    with pytest.raises(OSError):
+        ejecutar(str(tmp_path / "entrada.csv"), str(tmp_path / "no_existe" / "salida.csv"), **comunes)
+    assert not os.path.exists(rutas["ruta_modelo_frases"])
+
+    resultado = ejecutar(str(tmp_path / "entrada.csv"), str(tmp_path / "salida.csv"), **comunes)
+    palabras = sum(len(t.split()) for t in resultado["Procesado"] if t)
+    assert cargar_frases(rutas["ruta_modelo_frases"]).corpus_word_count == palabras > 0
+    assert os.path.exists(rutas["ruta_fraseador"])
+
+
+def test_idioma_sin_pack():
+    from nlp_processor.app.nlp import idiomas
+
+    assert set(idiomas.codigos()) >= {"E", "A"}
+    assert idiomas.pack(" e ").CODIGO == "E"
+    assert idiomas.pack("F") is None and idiomas.modelos_de("F") == []
@@ -0,0 +1,113 @@
+# ==========================================================
+# Generador de corpus sintéticos ES/DE con el formato de tweets_format.csv
+# ==========================================================
+# Uso (desde backend/):
+#   python -m nlp_processor.benchmarks.generar_corpus --filas 100000 --salida corpus_100k.csv
+import argparse
+import csv
+import os
+import random
+import re
+from datetime import datetime, timedelta
+
+ARCHIVO_MODELO = os.path.join(
+    os.path.dirname(__file__), "..", "app", "nlp", "Data", "tweets_format.csv"
+)
+TAMANOS = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+COLUMNAS = ["Fecha", "Hora", "Likes", "Tweet", "Lang"]
+
+# Frases de respaldo si no está el CSV original
+_RESPALDO = {
+    "E": [
+        "Llevamos 30 minutos de retraso en la línea 3",
+        "El metro de Pantitlán está sucio y lleno",
+        "Gracias por la rápida atención en Bellas Artes",
+        "Otra vez cancelaron el tren sin avisar",
+        "El servicio fue puntual y cómodo hoy",
+    ],
+    "A": [
+        "Die U-Bahn hat schon wieder Verspätung",
+        "Der Zug war sauber und pünktlich",
+        "Keine Information über den Ausfall am Hauptbahnhof",
+        "Danke für den freundlichen Service heute",
+        "Der Bus ist völlig überfüllt",
+    ],
+}
+_CUENTAS = {"E": ["MetroCDMX", "DenunciasAntio2", "PoliciaMedellin"],
+            "A": ["WienerLinien", "DB_Bahn", "oebb"]}
+_HACE = ["1h", "3m", "8m", "12h", "Nov 17", "Nov 12"]
+
+
+# -------------------------------
+# Paso 1: Frases por idioma a partir del corpus real
+# -------------------------------
+def cargar_frases(archivo=ARCHIVO_MODELO):
+    if not os.path.exists(archivo):
+        return {lang: list(frases) for lang, frases in _RESPALDO.items()}
+
+    frases = {"E": [], "A": []}
+    with open(archivo, encoding="utf-8-sig", newline="") as f:
+        for fila in csv.DictReader(f):
+            lang = fila["Lang"] if fila["Lang"] in frases else "A"
+            # Quitar cabecera (nombre, @usuario, ·, hace) y contadores finales
+            lineas = [l.strip() for l in fila["Tweet"].split("\n")]
+            cuerpo = [l for l in lineas[4:] if l and not l.startswith("@")
+                      and not re.fullmatch(r"[\d.,]+[KM]?|Replying to|and|…", l)]
+            for frase in re.split(r"(?<=[.!?])\s+", " ".join(cuerpo)):
+                if len(frase.split()) >= 4:
+                    frases[lang].append(frase)
+    for lang in frases:
+        if not frases[lang]:
+            frases[lang] = list(_RESPALDO[lang])
+    return frases
+
+
+# -------------------------------
+# Paso 2: Tweet sintético
+# -------------------------------
+def _tweet(rng, frases, lang):
+    usuario = f"user{rng.randrange(10**6)}"
+    cabecera = [usuario.title(), f"@{usuario}", "·", rng.choice(_HACE)]
+    if rng.random() < 0.6:
+        cabecera += ["Replying to ", f"@{rng.choice(_CUENTAS[lang])}"]
+    cuerpo = " ".join(rng.choice(frases[lang]) for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.2:
+        cuerpo += f" https://t.co/{rng.randrange(16**8):08x}"
+    contadores = [str(rng.randint(0, 50)) for _ in range(rng.randint(0, 3))]
+    return "\n".join(cabecera + [cuerpo] + contadores)
+
+
+def generar(filas, salida, prop_es=0.54, semilla=42, frases=None):
+    """Escribe ``filas`` tweets sintéticos (≈54% ES como el corpus real)."""
+    rng = random.Random(semilla)
+    frases = frases or cargar_frases()
+    inicio = datetime(2024, 1, 1)
+
+    with open(salida, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNAS)
+        for _ in range(filas):
+            lang = "E" if rng.random() < prop_es else "A"
+            momento = inicio + timedelta(seconds=rng.randrange(2 * 365 * 24 * 3600))
+            writer.writerow([
+                momento.strftime("%Y-%m-%d %H:%M"),
+                momento.strftime("%H:%M:%S"),
+                rng.randint(0, 500),
+                _tweet(rng, frases, lang),
+                lang,
+            ])
+    return salida
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Corpus sintético ES/DE para benchmarks")
+    parser.add_argument("--filas", default="10k",
+                        help="10k, 100k, 1m o un número de filas")
+    parser.add_argument("--salida", default=None)
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    n = TAMANOS.get(args.filas.lower()) or int(args.filas)
+    salida = args.salida or f"corpus_{args.filas.lower()}.csv"
+    generar(n, salida, semilla=args.semilla)
+    print(f"✅ {n} tweets sintéticos guardados en {salida}")
@@ -0,0 +1,108 @@
+# ==========================================================
+# Modelos sustitutos: pequeños, deterministas y sin descargas
+# ==========================================================
+# Mantienen la interfaz que usa el pipeline (spaCy Language, .encode de
+# SBERT, .predict de Flair) para medir el coste de cada etapa en CPU y
+# sin conexión. Los resultados NO son comparables en calidad.
+import zlib
+
+import numpy as np
+
+from ..app.nlp import idiomas, modelos
+
+DIM = 384  # misma dimensión que paraphrase-multilingual-MiniLM-L12-v2
+CUBETAS = 2 ** 14
+
+# Palabras sueltas de los gazetteers de los packs + algunas ciudades
+GAZETTEER = {
+    palabra.lower()
+    for codigo in idiomas.codigos()
+    for lugar in idiomas.pack(codigo).GAZETTEER
+    for palabra in lugar.split()
+} | {"hidalgo", "tláhuac", "wien", "berlin", "münchen", "hamburg"}
+
+
+# -------------------------------
+# spaCy: tokenizador en blanco + lema = minúsculas
+# -------------------------------
+def _spacy_ligero(lang):
+    import spacy
+    from spacy.language import Language
+
+    if not Language.has_factory("lema_minusculas"):
+        @Language.component("lema_minusculas")
+        def lema_minusculas(doc):
+            for token in doc:
+                token.lemma_ = token.lower_
+            return doc
+
+    nlp = spacy.blank(lang)
+    nlp.add_pipe("lema_minusculas")
+    return nlp
+
+
+# -------------------------------
+# SBERT: bolsa de palabras con hashing + proyección aleatoria fija
+# -------------------------------
+class EmbedderLigero:
+    def __init__(self, dim=DIM, semilla=0):
+        rng = np.random.default_rng(semilla)
+        self.tabla = rng.standard_normal((CUBETAS, dim)).astype(np.float32)
+
+    def encode(self, textos, batch_size=32, convert_to_numpy=True, **kwargs):
+        if isinstance(textos, str):
+            textos = [textos]
+        salida = np.zeros((len(textos), self.tabla.shape[1]), dtype=np.float32)
+        for i, texto in enumerate(textos):
+            idx = [zlib.crc32(t.encode("utf-8")) % CUBETAS for t in texto.split()]
+            if idx:
+                salida[i] = self.tabla[idx].mean(axis=0)
+        normas = np.linalg.norm(salida, axis=1, keepdims=True)
+        return salida / np.where(normas == 0, 1, normas)
+
+
+# -------------------------------
+# Flair: NER por diccionario y sentimiento por léxico
+# -------------------------------
+class TaggerLigero:
+    def predict(self, sentences, mini_batch_size=32, **kwargs):
+        if not isinstance(sentences, list):
+            sentences = [sentences]
+        for sentence in sentences:
+            for i, token in enumerate(sentence):
+                if token.text.lower() in GAZETTEER:
+                    sentence[i:i + 1].add_label("ner", "LOC")
+
+
+class SentimientoLigero:
+    def __init__(self):
+        packs = [idiomas.pack(c) for c in idiomas.codigos()]
+        self.positivas = {w.lower() for p in packs for w in p.SEMILLAS_POS}
+        self.negativas = {w.lower() for p in packs for w in p.SEMILLAS_NEG}
+
+    def predict(self, sentences, mini_batch_size=32, **kwargs):
+        if not isinstance(sentences, list):
+            sentences = [sentences]
+        for sentence in sentences:
+            if not len(sentence):
+                continue
+            palabras = [t.text.lower() for t in sentence]
+            balance = (sum(p in self.positivas for p in palabras)
+                       - sum(p in self.negativas for p in palabras))
+            label = "NEGATIVE" if balance < 0 else "POSITIVE"
+            sentence.add_label("sentiment", label, min(0.5 + 0.1 * abs(balance), 1.0))
+
+
+def instalar():
+    """Sustituye en el registro todos los modelos pesados por los ligeros."""
+    from ..app.nlp.cleaner1 import stopwords
+    from ..app.nlp.Emociones4 import eje_semaxis
+
+    for codigo in idiomas.codigos():
+        pack = idiomas.pack(codigo)
+        modelos.sustituir(idiomas.modelo_spacy(pack), lambda nombre=pack.NOMBRE: _spacy_ligero(nombre))
+        modelos.sustituir(idiomas.modelo_ner(pack), TaggerLigero)
+    modelos.sustituir("sbert", EmbedderLigero)
+    modelos.sustituir("sentimiento", SentimientoLigero)
+    stopwords.cache_clear()
+    eje_semaxis.cache_clear()
@@ -0,0 +1,221 @@
+# ==========================================================
+# Benchmark de extremo a extremo: filas/seg y RSS máximo por etapa
+# ==========================================================
+# Uso (desde backend/):
+#   python -m nlp_processor.benchmarks.run_benchmarks --tamanos 10k,100k --salida bench.json
+#   python -m nlp_processor.benchmarks.run_benchmarks --baseline bench_base.json
+# Por defecto usa modelos ligeros (CPU, sin conexión); --modelos reales usa los del pipeline.
+# Cada etapa se mide --repeticiones veces y se guarda la mediana.
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from .generar_corpus import TAMANOS, cargar_frases, generar
+
+ETAPAS = [
+    "limpiar_bruto", "procesar_spacy", "detectar_bigramas", "embedding",
+    "umap", "bertopic", "semaxis", "flair", "clustering",
+]
+# Etapas de las que no depende ninguna otra: se pueden omitir
+OPCIONALES = {"umap", "bertopic", "flair"}
+REPETICIONES = 3
+# Etapas más cortas que esto (en el baseline) no se comparan: el ruido supera la tolerancia
+MIN_SEGUNDOS = 0.25
+
+
+def reiniciar_pico_rss():
+    """Reinicia el pico de RSS del proceso (Linux, VmHWM). False si no se puede.
+
+    ru_maxrss nunca baja: sin esto cada etapa reportaría el pico de la más pesada anterior.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def rss_max_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return maximo / (1024 * 1024) if sys.platform == "darwin" else maximo / 1024
+
+
+def _medir(resultados, etapa, filas, funcion, repeticiones=1):
+    por_etapa = reiniciar_pico_rss()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        salida = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    segundos = statistics.median(tiempos)
+    resultados[etapa] = {
+        "filas": filas,
+        "repeticiones": repeticiones,
+        "segundos": round(segundos, 4),
+        "filas_seg": round(filas / segundos, 2) if segundos > 0 else None,
+        "rss_max_mb": round(rss_max_mb(), 1),
+        # False: pico acumulado del proceso (plataformas sin /proc/self/clear_refs)
+        "rss_por_etapa": por_etapa,
+    }
+    print(f"⏱️ {etapa}: {segundos:.2f} s ({resultados[etapa]['filas_seg']} filas/s, "
+          f"RSS máx {resultados[etapa]['rss_max_mb']} MB)")
+    return salida
+
+
+# -------------------------------
+# Corrida completa sobre un corpus
+# -------------------------------
+def ejecutar(ruta_corpus, omitir=(), min_topic_size=20, repeticiones=REPETICIONES):
+    import pandas as pd
+
+    from clustering_engine.cluster.kmeans_cluster import agrupar_semaxis
+    from ..app.nlp import Flair4
+    from ..app.nlp.BerTopic3 import entrenar_topics
+    from ..app.nlp.cleaner1 import detectar_bigramas, limpiar_bruto, procesar_spacy, unificar_alias
+    from ..app.nlp.Emociones4 import calcular_semaxis
+    from ..app.nlp.embeddings2 import normalizar_embeddings, obtener_embeddings, reducir_umap
+
+    r = {}
+    df = pd.read_csv(ruta_corpus)
+    n = len(df)
+
+    def _etapa(etapa, filas, funcion):
+        return _medir(r, etapa, filas, funcion, repeticiones)
+
+    def _limpiar():
+        df["Tweet_Limpio_Bruto"] = df["Tweet"].apply(limpiar_bruto)
+        df["Tweet_limpio"] = df["Tweet_Limpio_Bruto"].apply(unificar_alias)
+        return df.drop(columns=["Tweet"])
+
+    df = _etapa("limpiar_bruto", n, _limpiar)
+    df["Procesado"] = _etapa("procesar_spacy", n, lambda: df.apply(
+        lambda x: procesar_spacy(x["Tweet_limpio"], x["Lang"]), axis=1))
+    # Modelo de frases en un directorio temporal (no toca el de producción), uno
+    # por repetición: si no, add_vocab sumaría los conteos de la anterior
+    with tempfile.TemporaryDirectory() as tmp:
+        def _bigramas():
+            ruta = tempfile.mkdtemp(dir=tmp)
+            return detectar_bigramas(df.copy(), ruta_modelo=os.path.join(ruta, "frases"),
+                                     ruta_fraseador=os.path.join(ruta, "fraseador"))
+
+        df = _etapa("detectar_bigramas", n, _bigramas)
+
+    # Mismo filtro que embeddings2.cargar_tweets
+    df = df[df["Tweet_limpio"].notna() & (df["Tweet_limpio"] != "")].reset_index(drop=True)
+    n = len(df)
+    tweets = df["Tweet_limpio"].tolist()
+
+    embeddings = _etapa("embedding", n, lambda: obtener_embeddings(tweets))
+    if "umap" not in omitir:
+        _etapa("umap", n, lambda: reducir_umap(normalizar_embeddings(embeddings)))
+    if "bertopic" not in omitir:
+        _etapa("bertopic", n, lambda: entrenar_topics(tweets, embeddings, min_topic_size))
+    df["SemAxis_Score"] = _etapa("semaxis", n, lambda: calcular_semaxis(embeddings, df["Lang"]))
+    if "flair" not in omitir:
+        _etapa("flair", n, lambda: Flair4.procesar(df.copy()))
+    _etapa("clustering", n, lambda: agrupar_semaxis(df["SemAxis_Score"]))
+    return r
+
+
+# -------------------------------
+# Comparación contra baseline
+# -------------------------------
+def comparar(actual, baseline, tolerancia=0.2, min_segundos=MIN_SEGUNDOS):
+    """Etapas cuyo filas/seg (mediana) cayó más de ``tolerancia`` respecto al baseline.
+
+    Las que duraron menos de ``min_segundos`` en el baseline no se comparan.
+    """
+    base = {(c["filas_corpus"], e): m for c in baseline["corridas"] for e, m in c["etapas"].items()}
+    regresiones = []
+    for corrida in actual["corridas"]:
+        for etapa, medida in corrida["etapas"].items():
+            previa = base.get((corrida["filas_corpus"], etapa))
+            if not previa or not previa.get("filas_seg") or not medida.get("filas_seg"):
+                continue
+            if previa.get("segundos", 0) < min_segundos:
+                continue
+            cambio = medida["filas_seg"] / previa["filas_seg"] - 1
+            if cambio < -tolerancia:
+                regresiones.append({"filas_corpus": corrida["filas_corpus"], "etapa": etapa,
+                                    "antes": previa["filas_seg"], "ahora": medida["filas_seg"],
+                                    "cambio": round(cambio, 3)})
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark por etapa del pipeline NLP")
+    parser.add_argument("--tamanos", default="10k", help="lista: 10k,100k,1m o números")
+    parser.add_argument("--modelos", choices=["ligeros", "reales"], default="ligeros")
+    parser.add_argument("--omitir", default="", help=f"etapas opcionales: {','.join(sorted(OPCIONALES))}")
+    parser.add_argument("--dir-corpus", default=os.path.join(tempfile.gettempdir(), "p60_corpus"))
+    parser.add_argument("--salida", default="bench_resultados.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--min-segundos", type=float, default=MIN_SEGUNDOS,
+                        help="no comparar etapas más cortas que esto en el baseline")
+    args = parser.parse_args(argv)
+
+    omitir = {e for e in args.omitir.split(",") if e}
+    if omitir - OPCIONALES:
+        parser.error(f"solo se pueden omitir: {', '.join(sorted(OPCIONALES))}")
+
+    if args.modelos == "ligeros":
+        from .modelos_ligeros import instalar
+
+        instalar()
+
+    os.makedirs(args.dir_corpus, exist_ok=True)
+    frases = None
+    resultado = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "cpus": os.cpu_count(),
+        "modelos": args.modelos,
+        "corridas": [],
+    }
+    for tamano in args.tamanos.split(","):
+        filas = TAMANOS.get(tamano.lower()) or int(tamano)
+        ruta = os.path.join(args.dir_corpus, f"corpus_{filas}.csv")
+        if not os.path.exists(ruta):
+            frases = frases or cargar_frases()
+            generar(filas, ruta, frases=frases)
+        print(f"\n📊 Corpus de {filas} filas ({ruta})")
+        etapas = ejecutar(ruta, omitir, repeticiones=args.repeticiones)
+        resultado["corridas"].append({"filas_corpus": filas, "etapas": etapas})
+
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados guardados en {args.salida}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regresiones = comparar(resultado, json.load(f), args.tolerancia, args.min_segundos)
+        for reg in regresiones:
+            print(f"❌ {reg['etapa']} ({reg['filas_corpus']} filas): "
+                  f"{reg['antes']} -> {reg['ahora']} filas/s ({reg['cambio']:+.1%})")
+        if regresiones:
+            return 1
+        print("✅ Sin regresiones respecto al baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
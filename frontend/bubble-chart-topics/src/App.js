@@ -1,16 +1,124 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { ScatterChart, Scatter, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
 import Papa from 'papaparse';
 import { Upload, X, Mail, Twitter } from 'lucide-react';
 
+// API que publica el snapshot de topics (vacío = mismo origen)
+const API_URL = process.env.REACT_APP_API_URL || '';
+// main_api los sirve en /insights/topics e insights_api en /topics
+const RUTAS_TOPICS = process.env.REACT_APP_TOPICS_PATH
+  ? [process.env.REACT_APP_TOPICS_PATH]
+  : ['/insights/topics', '/topics'];
+const REFRESCO_MS = 60000;
+
 export default function TopicAnalysis() {
   const [data, setData] = useState([]);
-  const [loading, setLoading] = useState(false);
+  const [loading, setLoading] = useState(true);
   const [stats, setStats] = useState(null);
   const [selectedTopic, setSelectedTopic] = useState(null);
   const [sourceData, setSourceData] = useState([]);
 
+  // Estado del snapshot: versión cargada y topics por id (para aplicar deltas)
+  const version = useRef(null);
+  const huella = useRef(null);
+  const rutaTopics = useRef(null);
+  const topicsPorId = useRef(new Map());
+  const modoCSV = useRef(false);
+
+  const aplicarSnapshot = (topics, resumen) => {
+    const processedData = topics
+      .map(t => ({
+        topic: `Tema ${t.topicId}`,
+        topicId: t.topicId,
+        total: t.total,
+        langA: t.langA,
+        langE: t.langE,
+        avgSentiment: t.avgSentiment ?? 0,
+        avgSemaxis: t.avgSemaxis,
+        clusters: t.clusters,
+        propA: t.total > 0 ? (t.langA / t.total) * 100 : 0,
+        keywords: t.keywords.join(', '),
+        repTweet: t.repTweet,
+        tweets: t.tweets
+      }))
+      .sort((a, b) => a.avgSentiment - b.avgSentiment)
+      .map((item, index) => ({ ...item, yPosition: index + 1 }));
+
+    setSourceData([
+      { name: 'Correos', value: resumen.totalCorreos, color: '#3b82f6' },
+      { name: 'Tweets', value: resumen.totalTweetsSource, color: '#10b981' }
+    ]);
+    setData(processedData);
+    setStats({
+      ...resumen,
+      totalTopics: processedData.length,
+      langData: [
+        { name: 'Alemán', value: resumen.totalAleman, color: '#f59e0b' },
+        { name: 'Español', value: resumen.totalEspanol, color: '#ec4899' }
+      ]
+    });
+    setSelectedTopic(prev => prev && (processedData.find(d => d.topicId === prev.topicId) || null));
+  };
+
+  // Snapshot al abrir y deltas periódicos; sin API queda la carga de CSV
+  useEffect(() => {
+    let cancelado = false;
+
+    const pedirSnapshot = async () => {
+      for (const ruta of rutaTopics.current ? [rutaTopics.current] : RUTAS_TOPICS) {
+        const res = await fetch(`${API_URL}${ruta}/snapshot`);
+        if (res.ok) {
+          rutaTopics.current = ruta;
+          return res;
+        }
+      }
+      return null;
+    };
+
+    const actualizar = async () => {
+      if (modoCSV.current) return;
+      try {
+        const res = version.current
+          ? await fetch(`${API_URL}${rutaTopics.current}/delta?desde=${version.current}&hash=${huella.current}`)
+          : await pedirSnapshot();
+        if (cancelado) return;
+        if (!res || !res.ok) {
+          // Sin delta posible: la próxima vez se pide el snapshot completo
+          version.current = null;
+          return;
+        }
+        const body = await res.json();
+        if (cancelado || modoCSV.current) return;
+
+        if (body.topics) {
+          topicsPorId.current = new Map(body.topics.map(t => [t.topicId, t]));
+        } else {
+          if (body.version === version.current && body.hash === huella.current) return;
+          if (body.completo) topicsPorId.current = new Map();
+          body.eliminados.forEach(id => topicsPorId.current.delete(id));
+          body.cambiados.forEach(t => topicsPorId.current.set(t.topicId, t));
+        }
+        version.current = body.version;
+        huella.current = body.hash;
+        aplicarSnapshot([...topicsPorId.current.values()], body.stats);
+      } catch (error) {
+        console.warn('Snapshot de topics no disponible:', error);
+      } finally {
+        if (!cancelado && !modoCSV.current) setLoading(false);
+      }
+    };
+
+    actualizar();
+    const intervalo = setInterval(actualizar, REFRESCO_MS);
+    return () => {
+      cancelado = true;
+      clearInterval(intervalo);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
   const processCSV = (file) => {
+    modoCSV.current = true;
     setLoading(true);
     Papa.parse(file, {
       header: true,
@@ -452,6 +560,7 @@ export default function TopicAnalysis() {
 
             <button
               onClick={() => {
+                modoCSV.current = true;
                 setData([]);
                 setStats(null);
                 setSelectedTopic(null);